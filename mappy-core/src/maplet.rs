@@ -15,6 +15,13 @@ use std::marker::PhantomData;
 use std::sync::Arc;
 use tokio::sync::RwLock;
 
+/// Number of independent locks the value map is partitioned across.
+///
+/// Concurrent writers mostly land on disjoint shards (fingerprints are
+/// well mixed), so merge-heavy workloads no longer serialize on a single
+/// map-wide lock. Must be a power of two for the mask in `value_shard`.
+const VALUE_SHARDS: usize = 16;
+
 /// Core maplet data structure
 ///
 /// A maplet provides space-efficient approximate key-value mappings with
@@ -34,8 +41,9 @@ where
     config: MapletConfig,
     /// Quotient filter for fingerprint storage
     filter: Arc<RwLock<QuotientFilter>>,
-    /// Map of fingerprints to values (not aligned with slots)
-    values: Arc<RwLock<std::collections::HashMap<u64, V>>>,
+    /// Map of fingerprints to values (not aligned with slots), partitioned
+    /// into `VALUE_SHARDS` independently locked shards to reduce contention
+    values: Arc<Vec<RwLock<std::collections::HashMap<u64, V>>>>,
     /// Merge operator for combining values
     operator: Op,
     /// Collision detector for monitoring hash collisions
@@ -92,7 +100,11 @@ where
         Ok(Self {
             config,
             filter: Arc::new(RwLock::new(filter)),
-            values: Arc::new(RwLock::new(std::collections::HashMap::new())),
+            values: Arc::new(
+                (0..VALUE_SHARDS)
+                    .map(|_| RwLock::new(std::collections::HashMap::new()))
+                    .collect(),
+            ),
             operator,
             collision_detector: Arc::new(RwLock::new(collision_detector)),
             perfect_hash,
@@ -114,21 +126,23 @@ where
 
         let fingerprint = self.hash_key(&key);
 
-        // Check if key already exists in values HashMap (more reliable than filter)
-        let values_guard = self.values.read().await;
-        let key_exists = values_guard.contains_key(&fingerprint);
-        drop(values_guard);
-
-        if key_exists {
+        // Upsert under one shard write lock: checking existence with a
+        // read lock and re-locking to act lets two inserts of the same
+        // key both take the new-key path (double filter insert, lost
+        // merge, double len increment). Lock order matches `delete`:
+        // shard, then filter, then len.
+        let mut values_guard = self.value_shard(fingerprint).write().await;
+        if let Some(existing_value) = values_guard.get(&fingerprint) {
             // Key exists, merge with existing value
-            self.merge_value(fingerprint, value).await?;
+            let merged_value = self.operator.merge(existing_value.clone(), value)?;
+            values_guard.insert(fingerprint, merged_value);
         } else {
             // New key, insert into filter and store value
             {
                 let mut filter_guard = self.filter.write().await;
                 filter_guard.insert(fingerprint)?;
             }
-            self.store_value(fingerprint, value).await?;
+            values_guard.insert(fingerprint, value);
             {
                 let mut len_guard = self.len.write().await;
                 *len_guard += 1;
@@ -138,10 +152,47 @@ where
         Ok(())
     }
 
+    /// Remove all items, retaining the allocated backing storage
+    ///
+    /// Resets the quotient filter slots in place instead of reallocating,
+    /// so accumulator-style maplets can be reused without paying the
+    /// construction cost again.
+    pub async fn clear(&self) {
+        // Lock order: value shards (in index order), then filter, then
+        // detector/len. `delete` holds a shard guard while taking the
+        // filter guard, so taking the filter first and then awaiting
+        // shard locks here would ABBA-deadlock against it. All shard
+        // guards are held for the duration, keeping the wipe atomic.
+        let mut shard_guards = Vec::with_capacity(VALUE_SHARDS);
+        for shard in self.values.iter() {
+            shard_guards.push(shard.write().await);
+        }
+        let mut filter_guard = self.filter.write().await;
+        let mut detector_guard = self.collision_detector.write().await;
+        let mut len_guard = self.len.write().await;
+        filter_guard.clear();
+        for shard in shard_guards.iter_mut() {
+            shard.clear();
+        }
+        detector_guard.reset();
+        *len_guard = 0;
+    }
+
     /// Query a key to get its associated value
     pub async fn query(&self, key: &K) -> Option<V> {
-        let fingerprint = self.hash_key(key);
+        self.query_by_fingerprint(self.hash_key(key)).await
+    }
+
+    /// Compute the stable fingerprint handle for a key
+    ///
+    /// The handle can be passed to [`Self::query_by_fingerprint`] to skip
+    /// rehashing the key on repeated lookups of the same key set.
+    pub fn key_fingerprint(&self, key: &K) -> u64 {
+        self.hash_key(key)
+    }
 
+    /// Query by a fingerprint handle obtained from [`Self::key_fingerprint`]
+    pub async fn query_by_fingerprint(&self, fingerprint: u64) -> Option<V> {
         let filter_guard = self.filter.read().await;
         if !filter_guard.query(fingerprint) {
             return None;
@@ -149,7 +200,7 @@ where
         drop(filter_guard);
 
         // Get the value directly from the HashMap using the fingerprint
-        let values_guard = self.values.read().await;
+        let values_guard = self.value_shard(fingerprint).read().await;
         values_guard.get(&fingerprint).cloned()
     }
 
@@ -175,7 +226,7 @@ where
         drop(filter_guard);
 
         {
-            let mut values_guard = self.values.write().await;
+            let mut values_guard = self.value_shard(fingerprint).write().await;
             if let Some(existing_value) = values_guard.get(&fingerprint) {
                 // Check if the values match (for exact deletion)
                 if existing_value == value {
@@ -288,6 +339,11 @@ where
         ))
     }
 
+    /// Pick the value shard owning a fingerprint
+    fn value_shard(&self, fingerprint: u64) -> &RwLock<std::collections::HashMap<u64, V>> {
+        &self.values[(fingerprint as usize) & (VALUE_SHARDS - 1)]
+    }
+
     /// Hash a key to get its fingerprint
     fn hash_key(&self, key: &K) -> u64 {
         // Use the same hasher as the quotient filter
@@ -378,32 +434,6 @@ where
             .await
     }
 
-    /// Merge a value with an existing value at a fingerprint
-    async fn merge_value(&self, fingerprint: u64, value: V) -> MapletResult<()> {
-        {
-            let mut values_guard = self.values.write().await;
-            if let Some(existing_value) = values_guard.get(&fingerprint) {
-                let merged_value = self.operator.merge(existing_value.clone(), value)?;
-                values_guard.insert(fingerprint, merged_value);
-            } else {
-                // False positive or concurrent deletion - treat as new insertion
-                values_guard.insert(fingerprint, value);
-            }
-        }
-
-        Ok(())
-    }
-
-    /// Store a value at a fingerprint
-    async fn store_value(&self, fingerprint: u64, value: V) -> MapletResult<()> {
-        {
-            let mut values_guard = self.values.write().await;
-            values_guard.insert(fingerprint, value);
-        }
-
-        Ok(())
-    }
-
     /// Estimate memory usage in bytes
     const fn estimate_memory_usage(&self) -> usize {
         // QuotientFilter slots: always allocated for full capacity
@@ -553,6 +583,35 @@ mod tests {
         }
     }
 
+    #[tokio::test(flavor = "multi_thread", worker_threads = 4)]
+    async fn test_concurrent_same_key_inserts_merge() {
+        use std::sync::Arc;
+        use tokio::task;
+
+        let maplet = Arc::new(Maplet::<String, u64, CounterOperator>::new(100, 0.01).unwrap());
+        let mut handles = vec![];
+
+        // Hammer a single key from several tasks; the upsert must merge
+        // every increment (no lost counts, no double-counted key)
+        for _ in 0..8 {
+            let maplet_clone = Arc::clone(&maplet);
+            let handle = task::spawn(async move {
+                for _ in 0..100 {
+                    maplet_clone.insert("shared".to_string(), 1).await.unwrap();
+                }
+            });
+            handles.push(handle);
+        }
+
+        for handle in handles {
+            handle.await.unwrap();
+        }
+
+        assert_eq!(maplet.len().await, 1, "one unique key");
+        let value = maplet.query(&"shared".to_string()).await;
+        assert_eq!(value, Some(800), "no increment may be lost");
+    }
+
     #[tokio::test]
     async fn test_memory_usage_accuracy() {
         let maplet = Maplet::<String, u64, CounterOperator>::new(100, 0.01).unwrap();
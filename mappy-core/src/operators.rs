@@ -190,7 +190,7 @@ impl<T: Clone> MergeOperator<Vec<T>> for VectorConcatOperator {
 pub struct VectorOperator;
 
 impl MergeOperator<Vec<f64>> for VectorOperator {
-    fn merge(&self, left: Vec<f64>, right: Vec<f64>) -> MapletResult<Vec<f64>> {
+    fn merge(&self, mut left: Vec<f64>, right: Vec<f64>) -> MapletResult<Vec<f64>> {
         if left.len() != right.len() {
             return Err(crate::MapletError::Internal(format!(
                 "Vector length mismatch: {} != {}",
@@ -198,7 +198,12 @@ impl MergeOperator<Vec<f64>> for VectorOperator {
                 right.len()
             )));
         }
-        Ok(left.into_iter().zip(right).map(|(l, r)| l + r).collect())
+        // Accumulate in place: no per-merge allocation, and the slice
+        // iteration compiles to packed SIMD adds over the contiguous lanes
+        for (l, r) in left.iter_mut().zip(right) {
+            *l += r;
+        }
+        Ok(left)
     }
 
     fn identity(&self) -> Vec<f64> {
@@ -207,7 +212,7 @@ impl MergeOperator<Vec<f64>> for VectorOperator {
 }
 
 impl MergeOperator<Vec<f32>> for VectorOperator {
-    fn merge(&self, left: Vec<f32>, right: Vec<f32>) -> MapletResult<Vec<f32>> {
+    fn merge(&self, mut left: Vec<f32>, right: Vec<f32>) -> MapletResult<Vec<f32>> {
         if left.len() != right.len() {
             return Err(crate::MapletError::Internal(format!(
                 "Vector length mismatch: {} != {}",
@@ -215,7 +220,10 @@ impl MergeOperator<Vec<f32>> for VectorOperator {
                 right.len()
             )));
         }
-        Ok(left.into_iter().zip(right).map(|(l, r)| l + r).collect())
+        for (l, r) in left.iter_mut().zip(right) {
+            *l += r;
+        }
+        Ok(left)
     }
 
     fn identity(&self) -> Vec<f32> {
@@ -196,6 +196,13 @@ impl QuotientFilter {
         self.multiset_counts.get(&fingerprint).copied().unwrap_or(0)
     }
 
+    /// Reset the filter to its empty state without reallocating the slots
+    pub fn clear(&mut self) {
+        self.slots.fill(SlotMetadata::default());
+        self.len = 0;
+        self.multiset_counts.clear();
+    }
+
     /// Get the current number of items stored
     #[must_use]
     pub const fn len(&self) -> usize {
@@ -17,7 +17,7 @@ use mappy_core::{
     CounterOperator, Engine, EngineConfig, EngineStats, Maplet, MaxOperator, MinOperator,
     PersistenceMode, VectorOperator,
 };
-// use mappy_core::operators::MergeOperator;  // Not needed yet
+use mappy_core::operators::MergeOperator;
 use serde::{Deserialize, Serialize};
 use std::ffi::CString;
 use std::sync::Arc;
@@ -91,6 +91,28 @@ impl PyVectorOperator {
     }
 }
 
+/// Python wrapper for VectorOperator over f32 vectors
+///
+/// Same merge semantics as `PyVectorOperator` but stores `f32` components:
+/// half the memory bandwidth per accumulate and twice the SIMD lanes, at
+/// single precision. Suited to bandlimited-signal and embedding workloads
+/// where float32 tolerance is adequate.
+#[pyclass]
+#[derive(Clone, Copy)]
+pub struct PyVectorOperatorF32 {
+    inner: VectorOperator,
+}
+
+#[pymethods]
+impl PyVectorOperatorF32 {
+    #[new]
+    fn new() -> Self {
+        Self {
+            inner: VectorOperator,
+        }
+    }
+}
+
 // ============================================================================
 // Generic Maplet with Operator Support
 // ============================================================================
@@ -110,6 +132,285 @@ fn to_py_any_f64(py: Python<'_>, value: f64) -> Bound<PyAny> {
     py.eval(s.as_c_str(), None, None).unwrap()
 }
 
+/// Extract a `Vec<f64>` from a Python object, preferring the buffer protocol.
+///
+/// A C-contiguous 1-D float64 ndarray is copied with one memcpy via
+/// `PyBuffer`; lists and non-conforming arrays fall back to the per-element
+/// coercion path.
+fn extract_f64_vec(py: Python<'_>, value: &Bound<PyAny>) -> PyResult<Vec<f64>> {
+    if let Ok(buffer) = pyo3::buffer::PyBuffer::<f64>::get(value) {
+        if buffer.dimensions() == 1 {
+            if buffer.is_c_contiguous() {
+                return buffer.to_vec(py);
+            }
+            if let Some(vec) = read_strided_1d(&buffer) {
+                return Ok(vec);
+            }
+        }
+    }
+
+    let extract_items = |list: &Bound<PyList>| {
+        list.iter()
+            .map(|item| {
+                item.extract::<f64>()
+                    .or_else(|_| item.extract::<f32>().map(|x| f64::from(x)))
+                    .or_else(|_| item.extract::<i64>().map(|x| x as f64))
+                    .or_else(|_| item.extract::<i32>().map(|x| f64::from(x)))
+            })
+            .collect::<Result<Vec<f64>, _>>()
+    };
+
+    if let Ok(list) = value.cast::<PyList>() {
+        extract_items(list)
+    } else if value.getattr("shape").is_ok() {
+        let tolist = value.call_method0("tolist").map_err(|_| {
+            PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Could not call tolist() on numpy array",
+            )
+        })?;
+        let list = tolist.cast::<PyList>().map_err(|_| {
+            PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Could not convert numpy array tolist() result to list",
+            )
+        })?;
+        extract_items(&list)
+    } else {
+        value.extract()
+    }
+}
+
+/// Extract a `Vec<f32>` from a Python list or numpy array, with the same
+/// buffer-protocol fast path as the f64 variant.
+fn extract_f32_vec(py: Python<'_>, value: &Bound<PyAny>) -> PyResult<Vec<f32>> {
+    if let Ok(buffer) = pyo3::buffer::PyBuffer::<f32>::get(value) {
+        if buffer.dimensions() == 1 {
+            if buffer.is_c_contiguous() {
+                return buffer.to_vec(py);
+            }
+            if let Some(vec) = read_strided_1d(&buffer) {
+                return Ok(vec);
+            }
+        }
+    }
+    extract_f32_vec_slow(value)
+}
+
+/// Extract a key from either `str` or pre-encoded `bytes`.
+///
+/// Bytes keys let callers skip per-call unicode encoding on the Python side;
+/// they are validated as UTF-8 here so they hash identically to their `str`
+/// counterparts.
+fn extract_key(obj: &Bound<PyAny>) -> PyResult<String> {
+    if let Ok(s) = obj.extract::<String>() {
+        return Ok(s);
+    }
+    let bytes: Vec<u8> = obj.extract()?;
+    String::from_utf8(bytes).map_err(|e| {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("key is not valid UTF-8: {e}"))
+    })
+}
+
+/// Extract a key sequence accepting `str` or `bytes` elements.
+fn extract_keys(obj: &Bound<PyAny>) -> PyResult<Vec<String>> {
+    if let Ok(keys) = obj.extract::<Vec<String>>() {
+        return Ok(keys);
+    }
+    let list = obj.cast::<PyList>().map_err(|_| {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>("keys must be a list of str or bytes")
+    })?;
+    list.iter().map(|item| extract_key(&item)).collect()
+}
+
+/// Convert a float vector into a numpy ndarray with one memcpy.
+///
+/// Boxing every lane into a Python float and building a list costs O(n)
+/// object allocations on each query; viewing the raw lanes through
+/// `numpy.frombuffer` moves the whole payload in a single copy and gives
+/// callers a fixed ndarray return type. Falls back to a plain list when
+/// numpy is not importable.
+fn f64_vec_to_py(py: Python<'_>, vec: Vec<f64>) -> PyResult<PyObject> {
+    // SAFETY: f64 lanes are plain old data; the byte view lives only for the
+    // PyBytes construction below, which copies it.
+    let bytes: &[u8] = unsafe {
+        std::slice::from_raw_parts(vec.as_ptr().cast::<u8>(), std::mem::size_of_val(&vec[..]))
+    };
+    match py.import("numpy") {
+        Ok(np) => {
+            let buf = pyo3::types::PyBytes::new(py, bytes);
+            Ok(np.call_method1("frombuffer", (buf, "float64"))?.unbind())
+        }
+        Err(_) => Ok(PyList::new(py, vec)?.into_any().unbind()),
+    }
+}
+
+/// f32 counterpart of `f64_vec_to_py`.
+fn f32_vec_to_py(py: Python<'_>, vec: Vec<f32>) -> PyResult<PyObject> {
+    // SAFETY: as above; f32 lanes are plain old data.
+    let bytes: &[u8] = unsafe {
+        std::slice::from_raw_parts(vec.as_ptr().cast::<u8>(), std::mem::size_of_val(&vec[..]))
+    };
+    match py.import("numpy") {
+        Ok(np) => {
+            let buf = pyo3::types::PyBytes::new(py, bytes);
+            Ok(np.call_method1("frombuffer", (buf, "float32"))?.unbind())
+        }
+        Err(_) => Ok(PyList::new(py, vec)?.into_any().unbind()),
+    }
+}
+
+/// Run a batched membership scan across the runtime's worker threads.
+///
+/// Read-only lookups over an `Arc`'d maplet are embarrassingly parallel, so
+/// large key sets are split into chunks and spawned as tokio tasks; small
+/// sets stay on one task to avoid spawn overhead. Result order matches the
+/// input keys.
+fn parallel_contains<V, Op>(
+    runtime: &Runtime,
+    maplet: &Arc<Maplet<String, V, Op>>,
+    keys: &[String],
+) -> Vec<bool>
+where
+    V: Clone + PartialEq + std::fmt::Debug + Send + Sync + 'static,
+    Op: MergeOperator<V> + Default + Send + Sync + 'static,
+{
+    const CHUNK: usize = 1024;
+    if keys.len() <= CHUNK {
+        return runtime.block_on(async {
+            let mut out = Vec::with_capacity(keys.len());
+            for key in keys {
+                out.push(maplet.contains(key).await);
+            }
+            out
+        });
+    }
+    runtime.block_on(async {
+        let handles: Vec<_> = keys
+            .chunks(CHUNK)
+            .map(|chunk| {
+                let maplet = Arc::clone(maplet);
+                let chunk = chunk.to_vec();
+                tokio::spawn(async move {
+                    let mut out = Vec::with_capacity(chunk.len());
+                    for key in &chunk {
+                        out.push(maplet.contains(key).await);
+                    }
+                    out
+                })
+            })
+            .collect();
+        let mut results = Vec::with_capacity(keys.len());
+        for handle in handles {
+            results.extend(handle.await.expect("contains task panicked"));
+        }
+        results
+    })
+}
+
+/// Extract a `Vec<u64>` from a list or 1-D int64 numpy array, using the
+/// buffer protocol for the contiguous-ndarray case.
+fn extract_u64_values(py: Python<'_>, value: &Bound<PyAny>) -> PyResult<Vec<u64>> {
+    if let Ok(buffer) = pyo3::buffer::PyBuffer::<i64>::get(value) {
+        if buffer.dimensions() == 1 && buffer.is_c_contiguous() {
+            return buffer
+                .to_vec(py)?
+                .into_iter()
+                .map(|v| {
+                    u64::try_from(v).map_err(|_| {
+                        PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                            "negative value {v} cannot be inserted as u64"
+                        ))
+                    })
+                })
+                .collect();
+        }
+    }
+    value.extract()
+}
+
+/// Gather a strided 1-D buffer (e.g. a matrix column or step slice) into a
+/// `Vec` by walking the element stride directly, instead of bouncing every
+/// element through a Python object. Returns `None` for exotic layouts whose
+/// stride is not a whole number of elements.
+fn read_strided_1d<T: pyo3::buffer::Element + Copy>(
+    buffer: &pyo3::buffer::PyBuffer<T>,
+) -> Option<Vec<T>> {
+    let item_size = std::mem::size_of::<T>() as isize;
+    let stride_bytes = buffer.strides()[0];
+    if stride_bytes % item_size != 0 {
+        return None;
+    }
+    let stride = stride_bytes / item_size;
+    let len = buffer.shape()[0];
+    let ptr = buffer.buf_ptr().cast::<T>();
+    let mut out = Vec::with_capacity(len);
+    for i in 0..len {
+        // SAFETY: the buffer protocol guarantees `ptr + i * stride` stays
+        // within the exported buffer for i < shape[0], and the GIL held by
+        // the caller keeps the buffer alive for the duration of the read.
+        out.push(unsafe { *ptr.offset(i as isize * stride) });
+    }
+    Some(out)
+}
+
+/// Per-element fallback for `extract_f32_vec`, mirroring the lenient numeric
+/// coercion used for the f64 vector path.
+fn extract_f32_vec_slow(value: &Bound<PyAny>) -> PyResult<Vec<f32>> {
+    let extract_items = |list: &Bound<PyList>| {
+        list.iter()
+            .map(|item| {
+                item.extract::<f32>()
+                    .or_else(|_| item.extract::<f64>().map(|x| x as f32))
+                    .or_else(|_| item.extract::<i64>().map(|x| x as f32))
+                    .or_else(|_| item.extract::<i32>().map(|x| x as f32))
+            })
+            .collect::<Result<Vec<f32>, _>>()
+    };
+
+    if let Ok(list) = value.cast::<PyList>() {
+        extract_items(list)
+    } else if value.getattr("shape").is_ok() {
+        let tolist = value.call_method0("tolist").map_err(|_| {
+            PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Could not call tolist() on numpy array",
+            )
+        })?;
+        let list = tolist.cast::<PyList>().map_err(|_| {
+            PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Could not convert numpy array tolist() result to list",
+            )
+        })?;
+        extract_items(&list)
+    } else {
+        value.extract()
+    }
+}
+
+/// Validate a 2-D C-contiguous batch buffer against the key count and return
+/// the row width.
+fn check_batch_buffer<T: pyo3::buffer::Element>(
+    buffer: &pyo3::buffer::PyBuffer<T>,
+    num_keys: usize,
+    dtype: &str,
+) -> PyResult<usize> {
+    if buffer.dimensions() != 2 {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+            "insert_batch expects a 2-D (N, D) {dtype} array"
+        )));
+    }
+    if !buffer.is_c_contiguous() {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+            "insert_batch expects a C-contiguous array",
+        ));
+    }
+    let rows = buffer.shape()[0];
+    if rows != num_keys {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+            "key count {num_keys} does not match row count {rows}"
+        )));
+    }
+    Ok(buffer.shape()[1])
+}
+
 /// Enum for different maplet types based on operator
 pub enum PyMapletGenericInner {
     Counter(Arc<Maplet<String, u64, CounterOperator>>),
@@ -118,6 +419,7 @@ pub enum PyMapletGenericInner {
     MinU64(Arc<Maplet<String, u64, MinOperator>>),
     MinF64(Arc<Maplet<String, f64, MinOperator>>),
     Vector(Arc<Maplet<String, Vec<f64>, VectorOperator>>),
+    VectorF32(Arc<Maplet<String, Vec<f32>, VectorOperator>>),
 }
 
 /// Python wrapper for Maplet with operator support
@@ -175,6 +477,13 @@ impl PyMapletGeneric {
                     )
                     .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))?;
                     Ok(PyMapletGenericInner::Vector(Arc::new(maplet)))
+                } else if op.is_instance_of::<PyVectorOperatorF32>() {
+                    let maplet = Maplet::<String, Vec<f32>, VectorOperator>::new(
+                        capacity,
+                        false_positive_rate,
+                    )
+                    .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))?;
+                    Ok(PyMapletGenericInner::VectorF32(Arc::new(maplet)))
                 } else {
                     Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
                         "Unknown operator type",
@@ -191,158 +500,458 @@ impl PyMapletGeneric {
         Ok(Self { inner, runtime })
     }
 
-    fn insert(&mut self, key: String, value: Bound<PyAny>) -> PyResult<()> {
-        Python::with_gil(|py| {
-            match &self.inner {
-                PyMapletGenericInner::Counter(maplet) => {
-                    let val: u64 = value.extract()?;
+    fn insert(&self, py: Python, key: Bound<PyAny>, value: Bound<PyAny>) -> PyResult<()> {
+        let key = extract_key(&key)?;
+        // Extract the value into owned data while still holding the GIL,
+        // then release it for the runtime work so concurrent Python threads
+        // overlap inside the Rust layer.
+        match &self.inner {
+            PyMapletGenericInner::Counter(maplet) => {
+                let val: u64 = value.extract()?;
+                py.allow_threads(|| {
                     self.runtime
                         .block_on(async { maplet.insert(key, val).await })
-                        .map_err(|e| {
-                            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
-                        })?;
-                }
-                PyMapletGenericInner::MaxU64(maplet) => {
-                    let val: u64 = value.extract()?;
+                })
+                .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))
+            }
+            PyMapletGenericInner::MaxU64(maplet) => {
+                let val: u64 = value.extract()?;
+                py.allow_threads(|| {
                     self.runtime
                         .block_on(async { maplet.insert(key, val).await })
-                        .map_err(|e| {
-                            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
-                        })?;
-                }
-                PyMapletGenericInner::MaxF64(maplet) => {
-                    let val: f64 = value.extract()?;
+                })
+                .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))
+            }
+            PyMapletGenericInner::MaxF64(maplet) => {
+                let val: f64 = value.extract()?;
+                py.allow_threads(|| {
                     self.runtime
                         .block_on(async { maplet.insert(key, val).await })
-                        .map_err(|e| {
-                            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
-                        })?;
-                }
-                PyMapletGenericInner::MinU64(maplet) => {
-                    let val: u64 = value.extract()?;
+                })
+                .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))
+            }
+            PyMapletGenericInner::MinU64(maplet) => {
+                let val: u64 = value.extract()?;
+                py.allow_threads(|| {
                     self.runtime
                         .block_on(async { maplet.insert(key, val).await })
-                        .map_err(|e| {
-                            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
-                        })?;
-                }
-                PyMapletGenericInner::MinF64(maplet) => {
-                    let val: f64 = value.extract()?;
+                })
+                .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))
+            }
+            PyMapletGenericInner::MinF64(maplet) => {
+                let val: f64 = value.extract()?;
+                py.allow_threads(|| {
                     self.runtime
                         .block_on(async { maplet.insert(key, val).await })
-                        .map_err(|e| {
-                            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
-                        })?;
-                }
-                PyMapletGenericInner::Vector(maplet) => {
-                    // Handle NumPy arrays and lists
-                    let vec: Vec<f64> = if let Ok(list) = value.cast::<PyList>() {
-                        // Convert Python list to Vec<f64>
-                        list.iter()
-                            .map(|item| {
-                                item.extract::<f64>()
-                                    .or_else(|_| item.extract::<f32>().map(|x| x as f64))
-                                    .or_else(|_| item.extract::<i64>().map(|x| x as f64))
-                                    .or_else(|_| item.extract::<i32>().map(|x| x as f64))
-                            })
-                            .collect::<Result<Vec<f64>, _>>()?
-                    } else {
-                        // Try to get numpy array attributes
-                        if value.getattr("shape").is_ok() {
-                            // It's a numpy array - try to convert to list first, then extract
-                            if let Ok(tolist) = value.call_method0("tolist") {
-                                if let Ok(list) = tolist.cast::<PyList>() {
-                                    list.iter()
-                                        .map(|item| {
-                                            item.extract::<f64>()
-                                                .or_else(|_| {
-                                                    item.extract::<f32>().map(|x| x as f64)
-                                                })
-                                                .or_else(|_| {
-                                                    item.extract::<i64>().map(|x| x as f64)
-                                                })
-                                                .or_else(|_| {
-                                                    item.extract::<i32>().map(|x| x as f64)
-                                                })
-                                        })
-                                        .collect::<Result<Vec<f64>, _>>()?
-                                } else {
-                                    return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
-                                        "Could not convert numpy array tolist() result to list",
-                                    ));
-                                }
+                })
+                .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))
+            }
+            PyMapletGenericInner::Vector(maplet) => {
+                // Buffer-protocol fast path for float64 ndarrays, with a
+                // per-element fallback for lists and other sequences
+                let vec = extract_f64_vec(py, &value)?;
+                py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.insert(key, vec).await })
+                })
+                .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))
+            }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                let vec = extract_f32_vec(py, &value)?;
+                py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.insert(key, vec).await })
+                })
+                .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}")))
+            }
+        }
+    }
+
+    /// Batch insert for the vector operator: an entire (N, D) float64 matrix
+    /// crosses the FFI boundary in one call via the buffer protocol, instead
+    /// of N per-key `insert` calls each re-parsing a Python object.
+    fn insert_batch(&self, py: Python, keys: Bound<PyAny>, values: Bound<PyAny>) -> PyResult<()> {
+        let keys = extract_keys(&keys)?;
+        match &self.inner {
+            PyMapletGenericInner::Vector(maplet) => {
+                let maplet = Arc::clone(maplet);
+                let buffer = pyo3::buffer::PyBuffer::<f64>::get(&values)?;
+                let dim = check_batch_buffer(&buffer, keys.len(), "float64")?;
+                let data = buffer.to_vec(py)?;
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        for (i, key) in keys.into_iter().enumerate() {
+                            let row = data[i * dim..(i + 1) * dim].to_vec();
+                            maplet.insert(key, row).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
+            }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                let maplet = Arc::clone(maplet);
+                let buffer = pyo3::buffer::PyBuffer::<f32>::get(&values)?;
+                let dim = check_batch_buffer(&buffer, keys.len(), "float32")?;
+                let data = buffer.to_vec(py)?;
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        for (i, key) in keys.into_iter().enumerate() {
+                            let row = data[i * dim..(i + 1) * dim].to_vec();
+                            maplet.insert(key, row).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
+            }
+            _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "insert_batch requires a VectorOperator maplet",
+            )),
+        }
+    }
+
+    /// Bulk k-mer counting: slide a k-wide window over `sequence` and
+    /// count every window in one FFI crossing.
+    ///
+    /// `sequence` may be str or bytes (must be valid UTF-8); each window
+    /// is inserted with `value` (default 1) through the counter operator.
+    /// Pure A/C/G/T sequences with k <= 32 take a 2-bit packed rolling
+    /// path: each step shifts one base into a u64 code (O(1), no
+    /// re-hashing of k bytes), counts are aggregated per distinct code,
+    /// and one maplet insert runs per distinct k-mer. Other sequences
+    /// fall back to a per-window insert loop.
+    #[pyo3(signature = (sequence, k, value = 1))]
+    fn insert_kmers(
+        &self,
+        py: Python,
+        sequence: Bound<PyAny>,
+        k: usize,
+        value: u64,
+    ) -> PyResult<()> {
+        let sequence = extract_key(&sequence)?;
+        if k == 0 {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "k must be positive",
+            ));
+        }
+        match &self.inner {
+            PyMapletGenericInner::Counter(maplet) => {
+                let maplet = Arc::clone(maplet);
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        let bytes = sequence.as_bytes();
+                        if bytes.len() < k {
+                            return Ok(());
+                        }
+
+                        // base -> 2-bit code LUT; 255 marks a non-DNA byte
+                        let mut lut = [255u8; 256];
+                        lut[b'A' as usize] = 0;
+                        lut[b'C' as usize] = 1;
+                        lut[b'G' as usize] = 2;
+                        lut[b'T' as usize] = 3;
+
+                        let packable =
+                            k <= 32 && bytes.iter().all(|&b| lut[b as usize] != 255);
+                        if packable {
+                            let mask = if k == 32 {
+                                u64::MAX
                             } else {
-                                return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
-                                    "Could not call tolist() on numpy array",
-                                ));
+                                (1u64 << (2 * k)) - 1
+                            };
+                            let mut counts =
+                                std::collections::HashMap::<u64, u64>::new();
+                            let mut code: u64 = 0;
+                            for (i, &b) in bytes.iter().enumerate() {
+                                code = ((code << 2) | u64::from(lut[b as usize])) & mask;
+                                if i + 1 >= k {
+                                    *counts.entry(code).or_insert(0) += 1;
+                                }
                             }
-                        } else {
-                            // Try direct extraction
-                            value.extract()?
+                            // One insert per distinct k-mer; decode the packed
+                            // code back to its string so queries by key match
+                            for (code, occurrences) in counts {
+                                let kmer: String = (0..k)
+                                    .map(|j| {
+                                        let base = (code >> (2 * (k - 1 - j))) & 3;
+                                        b"ACGT"[base as usize] as char
+                                    })
+                                    .collect();
+                                maplet.insert(kmer, occurrences * value).await.map_err(
+                                    |e| {
+                                        PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                                            format!("{e}"),
+                                        )
+                                    },
+                                )?;
+                            }
+                            return Ok(());
                         }
-                    };
-                    self.runtime
-                        .block_on(async { maplet.insert(key, vec).await })
-                        .map_err(|e| {
-                            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
-                        })?;
-                }
+
+                        for window in bytes.windows(k) {
+                            // Windows of a valid UTF-8 ASCII sequence are
+                            // themselves valid; re-check cheaply for the
+                            // multi-byte case instead of panicking
+                            let kmer = std::str::from_utf8(window)
+                                .map_err(|_| {
+                                    PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                                        "sequence windows must fall on UTF-8 boundaries",
+                                    )
+                                })?
+                                .to_owned();
+                            maplet.insert(kmer, value).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
             }
-            Ok(())
-        })
+            _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "insert_kmers requires a CounterOperator maplet",
+            )),
+        }
     }
 
-    fn query(&self, key: &str) -> PyResult<Option<PyObject>> {
-        Python::with_gil(|py| -> PyResult<Option<PyObject>> {
-            match &self.inner {
-                PyMapletGenericInner::Counter(maplet) => {
-                    let result = self
-                        .runtime
-                        .block_on(async { maplet.query(&key.to_string()).await });
-                    Ok(result.map(|v| to_py_any_u64(py, v).into()))
-                }
-                PyMapletGenericInner::MaxU64(maplet) => {
-                    let result = self
-                        .runtime
-                        .block_on(async { maplet.query(&key.to_string()).await });
-                    Ok(result.map(|v| to_py_any_u64(py, v).into()))
-                }
-                PyMapletGenericInner::MaxF64(maplet) => {
-                    let result = self
-                        .runtime
-                        .block_on(async { maplet.query(&key.to_string()).await });
-                    Ok(result.map(|v| to_py_any_f64(py, v).into()))
-                }
-                PyMapletGenericInner::MinU64(maplet) => {
-                    let result = self
-                        .runtime
-                        .block_on(async { maplet.query(&key.to_string()).await });
-                    Ok(result.map(|v| to_py_any_u64(py, v).into()))
-                }
-                PyMapletGenericInner::MinF64(maplet) => {
-                    let result = self
-                        .runtime
-                        .block_on(async { maplet.query(&key.to_string()).await });
-                    Ok(result.map(|v| to_py_any_f64(py, v).into()))
-                }
-                PyMapletGenericInner::Vector(maplet) => {
-                    let result = self
-                        .runtime
-                        .block_on(async { maplet.query(&key.to_string()).await });
-                    if let Some(vec) = result {
-                        // Convert Vec<f64> to Python list (can be converted to numpy array in Python)
-                        let list = PyList::new(py, vec)?;
-                        Ok(Some(list.into()))
-                    } else {
-                        Ok(None)
-                    }
-                }
+    /// Batch insert for scalar operators: one FFI crossing for many
+    /// key/value pairs instead of N `insert` calls.
+    ///
+    /// `values` may be a list or a 1-D numpy array (int64 for counter/max/min
+    /// over integers, float64 for the float variants). Vector maplets take
+    /// their batches through `insert_batch`.
+    fn insert_many(&self, py: Python, keys: Bound<PyAny>, values: Bound<PyAny>) -> PyResult<()> {
+        let keys = extract_keys(&keys)?;
+        fn check_lengths(num_keys: usize, num_values: usize) -> PyResult<()> {
+            if num_keys == num_values {
+                Ok(())
+            } else {
+                Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                    "key count {num_keys} does not match value count {num_values}"
+                )))
             }
+        }
+
+        match &self.inner {
+            PyMapletGenericInner::Counter(maplet) => {
+                let vals = extract_u64_values(py, &values)?;
+                check_lengths(keys.len(), vals.len())?;
+                let maplet = Arc::clone(maplet);
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        for (key, val) in keys.into_iter().zip(vals) {
+                            maplet.insert(key, val).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
+            }
+            PyMapletGenericInner::MaxU64(maplet) => {
+                let vals = extract_u64_values(py, &values)?;
+                check_lengths(keys.len(), vals.len())?;
+                let maplet = Arc::clone(maplet);
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        for (key, val) in keys.into_iter().zip(vals) {
+                            maplet.insert(key, val).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
+            }
+            PyMapletGenericInner::MaxF64(maplet) => {
+                let vals = extract_f64_vec(py, &values)?;
+                check_lengths(keys.len(), vals.len())?;
+                let maplet = Arc::clone(maplet);
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        for (key, val) in keys.into_iter().zip(vals) {
+                            maplet.insert(key, val).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
+            }
+            PyMapletGenericInner::MinU64(maplet) => {
+                let vals = extract_u64_values(py, &values)?;
+                check_lengths(keys.len(), vals.len())?;
+                let maplet = Arc::clone(maplet);
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        for (key, val) in keys.into_iter().zip(vals) {
+                            maplet.insert(key, val).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
+            }
+            PyMapletGenericInner::MinF64(maplet) => {
+                let vals = extract_f64_vec(py, &values)?;
+                check_lengths(keys.len(), vals.len())?;
+                let maplet = Arc::clone(maplet);
+                let runtime = Arc::clone(&self.runtime);
+                py.allow_threads(move || {
+                    runtime.block_on(async {
+                        for (key, val) in keys.into_iter().zip(vals) {
+                            maplet.insert(key, val).await.map_err(|e| {
+                                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{e}"))
+                            })?;
+                        }
+                        Ok(())
+                    })
+                })
+            }
+            PyMapletGenericInner::Vector(_) | PyMapletGenericInner::VectorF32(_) => {
+                Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                    "use insert_batch for vector maplets",
+                ))
+            }
+        }
+    }
+
+    fn query(&self, py: Python, key: Bound<PyAny>) -> PyResult<Option<PyObject>> {
+        let key = extract_key(&key)?;
+        // The lookup runs with the GIL released; only the final result
+        // conversion re-touches Python objects.
+        match &self.inner {
+            PyMapletGenericInner::Counter(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime.block_on(async { maplet.query(&key).await })
+                });
+                Ok(result.map(|v| to_py_any_u64(py, v).into()))
+            }
+            PyMapletGenericInner::MaxU64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime.block_on(async { maplet.query(&key).await })
+                });
+                Ok(result.map(|v| to_py_any_u64(py, v).into()))
+            }
+            PyMapletGenericInner::MaxF64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime.block_on(async { maplet.query(&key).await })
+                });
+                Ok(result.map(|v| to_py_any_f64(py, v).into()))
+            }
+            PyMapletGenericInner::MinU64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime.block_on(async { maplet.query(&key).await })
+                });
+                Ok(result.map(|v| to_py_any_u64(py, v).into()))
+            }
+            PyMapletGenericInner::MinF64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime.block_on(async { maplet.query(&key).await })
+                });
+                Ok(result.map(|v| to_py_any_f64(py, v).into()))
+            }
+            PyMapletGenericInner::Vector(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime.block_on(async { maplet.query(&key).await })
+                });
+                result.map(|vec| f64_vec_to_py(py, vec)).transpose()
+            }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime.block_on(async { maplet.query(&key).await })
+                });
+                result.map(|vec| f32_vec_to_py(py, vec)).transpose()
+            }
+        }
+    }
+
+    /// Stable integer handle for a key, usable with `query_by_handle`.
+    ///
+    /// Hashing dominates tight repeated-lookup loops on a fixed key set;
+    /// computing the handle once and querying by it skips the per-call
+    /// rehash.
+    fn key_handle(&self, key: Bound<PyAny>) -> PyResult<u64> {
+        let key = extract_key(&key)?;
+        Ok(match &self.inner {
+            PyMapletGenericInner::Counter(maplet) => maplet.key_fingerprint(&key),
+            PyMapletGenericInner::MaxU64(maplet) => maplet.key_fingerprint(&key),
+            PyMapletGenericInner::MaxF64(maplet) => maplet.key_fingerprint(&key),
+            PyMapletGenericInner::MinU64(maplet) => maplet.key_fingerprint(&key),
+            PyMapletGenericInner::MinF64(maplet) => maplet.key_fingerprint(&key),
+            PyMapletGenericInner::Vector(maplet) => maplet.key_fingerprint(&key),
+            PyMapletGenericInner::VectorF32(maplet) => maplet.key_fingerprint(&key),
         })
     }
 
-    fn contains(&self, key: String) -> bool {
+    /// Query using a handle previously returned by `key_handle`.
+    fn query_by_handle(&self, py: Python, handle: u64) -> PyResult<Option<PyObject>> {
         match &self.inner {
+            PyMapletGenericInner::Counter(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.query_by_fingerprint(handle).await })
+                });
+                Ok(result.map(|v| to_py_any_u64(py, v).into()))
+            }
+            PyMapletGenericInner::MaxU64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.query_by_fingerprint(handle).await })
+                });
+                Ok(result.map(|v| to_py_any_u64(py, v).into()))
+            }
+            PyMapletGenericInner::MaxF64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.query_by_fingerprint(handle).await })
+                });
+                Ok(result.map(|v| to_py_any_f64(py, v).into()))
+            }
+            PyMapletGenericInner::MinU64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.query_by_fingerprint(handle).await })
+                });
+                Ok(result.map(|v| to_py_any_u64(py, v).into()))
+            }
+            PyMapletGenericInner::MinF64(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.query_by_fingerprint(handle).await })
+                });
+                Ok(result.map(|v| to_py_any_f64(py, v).into()))
+            }
+            PyMapletGenericInner::Vector(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.query_by_fingerprint(handle).await })
+                });
+                result.map(|vec| f64_vec_to_py(py, vec)).transpose()
+            }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                let result = py.allow_threads(|| {
+                    self.runtime
+                        .block_on(async { maplet.query_by_fingerprint(handle).await })
+                });
+                result.map(|vec| f32_vec_to_py(py, vec)).transpose()
+            }
+        }
+    }
+
+    fn contains(&self, py: Python, key: Bound<PyAny>) -> PyResult<bool> {
+        let key = extract_key(&key)?;
+        Ok(py.allow_threads(|| match &self.inner {
             PyMapletGenericInner::Counter(maplet) => {
                 self.runtime.block_on(async { maplet.contains(&key).await })
             }
@@ -361,7 +970,133 @@ impl PyMapletGeneric {
             PyMapletGenericInner::Vector(maplet) => {
                 self.runtime.block_on(async { maplet.contains(&key).await })
             }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                self.runtime.block_on(async { maplet.contains(&key).await })
+            }
+        }))
+    }
+
+    /// Batch membership check: one FFI call (and one GIL release) for many keys.
+    ///
+    /// Returns a list of booleans aligned with `keys`. Significantly cheaper
+    /// than calling `contains` in a Python loop for large key sets.
+    fn contains_batch(&self, py: Python, keys: Bound<PyAny>) -> PyResult<Vec<bool>> {
+        let keys = extract_keys(&keys)?;
+        let results = py.allow_threads(|| match &self.inner {
+            PyMapletGenericInner::Counter(maplet) => {
+                parallel_contains(&self.runtime, maplet, &keys)
+            }
+            PyMapletGenericInner::MaxU64(maplet) => {
+                parallel_contains(&self.runtime, maplet, &keys)
+            }
+            PyMapletGenericInner::MaxF64(maplet) => {
+                parallel_contains(&self.runtime, maplet, &keys)
+            }
+            PyMapletGenericInner::MinU64(maplet) => {
+                parallel_contains(&self.runtime, maplet, &keys)
+            }
+            PyMapletGenericInner::MinF64(maplet) => {
+                parallel_contains(&self.runtime, maplet, &keys)
+            }
+            PyMapletGenericInner::Vector(maplet) => {
+                parallel_contains(&self.runtime, maplet, &keys)
+            }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                parallel_contains(&self.runtime, maplet, &keys)
+            }
+        });
+        Ok(results)
+    }
+
+    /// Batch query: one FFI call (and one GIL release) for many keys.
+    ///
+    /// Returns a list aligned with `keys`, each entry the queried value or
+    /// None. All lookups run in Rust with the GIL released; only the final
+    /// result conversion touches Python objects.
+    fn query_many(&self, py: Python, keys: Bound<PyAny>) -> PyResult<PyObject> {
+        let keys = extract_keys(&keys)?;
+        enum BatchResults {
+            U64(Vec<Option<u64>>),
+            F64(Vec<Option<f64>>),
+            VecF64(Vec<Option<Vec<f64>>>),
+            VecF32(Vec<Option<Vec<f32>>>),
         }
+
+        let results = py.allow_threads(|| {
+            self.runtime.block_on(async {
+                match &self.inner {
+                    PyMapletGenericInner::Counter(maplet) => {
+                        let mut out = Vec::with_capacity(keys.len());
+                        for key in &keys {
+                            out.push(maplet.query(key).await);
+                        }
+                        BatchResults::U64(out)
+                    }
+                    PyMapletGenericInner::MaxU64(maplet) => {
+                        let mut out = Vec::with_capacity(keys.len());
+                        for key in &keys {
+                            out.push(maplet.query(key).await);
+                        }
+                        BatchResults::U64(out)
+                    }
+                    PyMapletGenericInner::MaxF64(maplet) => {
+                        let mut out = Vec::with_capacity(keys.len());
+                        for key in &keys {
+                            out.push(maplet.query(key).await);
+                        }
+                        BatchResults::F64(out)
+                    }
+                    PyMapletGenericInner::MinU64(maplet) => {
+                        let mut out = Vec::with_capacity(keys.len());
+                        for key in &keys {
+                            out.push(maplet.query(key).await);
+                        }
+                        BatchResults::U64(out)
+                    }
+                    PyMapletGenericInner::MinF64(maplet) => {
+                        let mut out = Vec::with_capacity(keys.len());
+                        for key in &keys {
+                            out.push(maplet.query(key).await);
+                        }
+                        BatchResults::F64(out)
+                    }
+                    PyMapletGenericInner::Vector(maplet) => {
+                        let mut out = Vec::with_capacity(keys.len());
+                        for key in &keys {
+                            out.push(maplet.query(key).await);
+                        }
+                        BatchResults::VecF64(out)
+                    }
+                    PyMapletGenericInner::VectorF32(maplet) => {
+                        let mut out = Vec::with_capacity(keys.len());
+                        for key in &keys {
+                            out.push(maplet.query(key).await);
+                        }
+                        BatchResults::VecF32(out)
+                    }
+                }
+            })
+        });
+
+        let list = match results {
+            BatchResults::U64(values) => PyList::new(py, values)?,
+            BatchResults::F64(values) => PyList::new(py, values)?,
+            BatchResults::VecF64(values) => {
+                let converted = values
+                    .into_iter()
+                    .map(|v| v.map(|vec| f64_vec_to_py(py, vec)).transpose())
+                    .collect::<PyResult<Vec<Option<PyObject>>>>()?;
+                PyList::new(py, converted)?
+            }
+            BatchResults::VecF32(values) => {
+                let converted = values
+                    .into_iter()
+                    .map(|v| v.map(|vec| f32_vec_to_py(py, vec)).transpose())
+                    .collect::<PyResult<Vec<Option<PyObject>>>>()?;
+                PyList::new(py, converted)?
+            }
+        };
+        Ok(list.into())
     }
 
     fn len(&self) -> usize {
@@ -384,6 +1119,9 @@ impl PyMapletGeneric {
             PyMapletGenericInner::Vector(maplet) => {
                 self.runtime.block_on(async { maplet.len().await })
             }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                self.runtime.block_on(async { maplet.len().await })
+            }
         }
     }
 
@@ -407,6 +1145,9 @@ impl PyMapletGeneric {
             PyMapletGenericInner::Vector(maplet) => {
                 self.runtime.block_on(async { maplet.is_empty().await })
             }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                self.runtime.block_on(async { maplet.is_empty().await })
+            }
         }
     }
 
@@ -418,6 +1159,7 @@ impl PyMapletGeneric {
             PyMapletGenericInner::MinU64(maplet) => maplet.error_rate(),
             PyMapletGenericInner::MinF64(maplet) => maplet.error_rate(),
             PyMapletGenericInner::Vector(maplet) => maplet.error_rate(),
+            PyMapletGenericInner::VectorF32(maplet) => maplet.error_rate(),
         }
     }
 
@@ -441,6 +1183,9 @@ impl PyMapletGeneric {
             PyMapletGenericInner::Vector(maplet) => {
                 self.runtime.block_on(async { maplet.load_factor().await })
             }
+            PyMapletGenericInner::VectorF32(maplet) => {
+                self.runtime.block_on(async { maplet.load_factor().await })
+            }
         }
     }
 
@@ -464,6 +1209,9 @@ impl PyMapletGeneric {
             PyMapletGenericInner::Vector(maplet) => Ok(self
                 .runtime
                 .block_on(async { maplet.find_slot_for_key(&key.to_string()).await })),
+            PyMapletGenericInner::VectorF32(maplet) => Ok(self
+                .runtime
+                .block_on(async { maplet.find_slot_for_key(&key.to_string()).await })),
         }
     }
 
@@ -515,20 +1263,40 @@ impl PyMapletGeneric {
                             Ok(false)
                         }
                     }
+                    PyMapletGenericInner::VectorF32(maplet) => {
+                        if let Some(value) = maplet.query(&key.to_string()).await {
+                            maplet.delete(&key.to_string(), &value).await
+                        } else {
+                            Ok(false)
+                        }
+                    }
                 }
             })
             .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("{}", e)))?;
         Ok(result)
     }
 
-    fn clear(&self) -> PyResult<()> {
-        // Maplet doesn't have a native clear() method.
-        // For clear functionality, use Engine instead of Maplet.
-        // As a workaround, we'll recreate the maplet by clearing the internal state.
-        // This is a limitation of the probabilistic data structure design.
-        Err(PyErr::new::<pyo3::exceptions::PyNotImplementedError, _>(
-            "clear() is not supported for Maplet. Use Engine for clear functionality, or recreate the Maplet.",
-        ))
+    /// Remove all items while keeping the allocated backing storage, so a
+    /// maplet can be reused without paying the construction cost again.
+    fn clear(&self) {
+        self.runtime.block_on(async {
+            match &self.inner {
+                PyMapletGenericInner::Counter(maplet) => maplet.clear().await,
+                PyMapletGenericInner::MaxU64(maplet) => maplet.clear().await,
+                PyMapletGenericInner::MaxF64(maplet) => maplet.clear().await,
+                PyMapletGenericInner::MinU64(maplet) => maplet.clear().await,
+                PyMapletGenericInner::MinF64(maplet) => maplet.clear().await,
+                PyMapletGenericInner::Vector(maplet) => maplet.clear().await,
+                PyMapletGenericInner::VectorF32(maplet) => maplet.clear().await,
+            }
+        });
+    }
+
+    /// Fast-path property for the common "how many items" check: returns
+    /// the counter directly without building the stats dict.
+    #[getter]
+    fn item_count(&self) -> usize {
+        self.len()
     }
 
     fn stats(&self) -> PyResult<PyObject> {
@@ -951,6 +1719,7 @@ fn mappy_python(py: Python, m: &Bound<PyModule>) -> PyResult<()> {
     m.add_class::<PyMaxOperator>()?;
     m.add_class::<PyMinOperator>()?;
     m.add_class::<PyVectorOperator>()?;
+    m.add_class::<PyVectorOperatorF32>()?;
 
     // Maplet classes
     m.add_class::<PyMaplet>()?; // Legacy
@@ -973,6 +1742,8 @@ fn mappy_python(py: Python, m: &Bound<PyModule>) -> PyResult<()> {
     m.add("MinOperator", py_min_op)?;
     let py_vector_op = m.getattr("PyVectorOperator")?;
     m.add("VectorOperator", py_vector_op)?;
+    let py_vector_op_f32 = m.getattr("PyVectorOperatorF32")?;
+    m.add("VectorOperatorF32", py_vector_op_f32)?;
 
     Ok(())
 }
@@ -4,9 +4,12 @@ import asyncio
 import random
 import string
 
+import mappy_python
 import numpy as np
 import pytest
 
+from .test_utils import generate_ml_embeddings
+
 
 class Stats:
     """Helper class to convert stats dict to object with attributes."""
@@ -27,6 +30,169 @@ class Stats:
             self.error_rate = getattr(stats_dict, "error_rate", 0.0)
 
 
+@pytest.fixture(scope="module")
+def _shared_vector_maplet():
+    """Single vector maplet per module; construction is amortized via clear()."""
+    return mappy_python.Maplet(
+        capacity=1000,
+        false_positive_rate=0.01,
+        operator=mappy_python.VectorOperator(),
+    )
+
+
+@pytest.fixture
+def vector_maplet(_shared_vector_maplet):
+    """A freshly cleared vector maplet (capacity 1000, 1% fp rate)."""
+    _shared_vector_maplet.clear()
+    return _shared_vector_maplet
+
+
+@pytest.fixture(scope="module")
+def _shared_counter_maplet_100k():
+    """Single 100k-capacity counter maplet per module, reused via clear()."""
+    return mappy_python.Maplet(
+        capacity=100000,
+        false_positive_rate=0.01,
+        operator=mappy_python.CounterOperator(),
+    )
+
+
+@pytest.fixture
+def counter_maplet_100k(_shared_counter_maplet_100k):
+    """A freshly cleared counter maplet (capacity 100000, 1% fp rate)."""
+    _shared_counter_maplet_100k.clear()
+    return _shared_counter_maplet_100k
+
+
+@pytest.fixture(scope="module")
+def _shared_counter_maplet_1m():
+    """Single 1M-capacity counter maplet per module; the alloc is large
+    enough that paying it once per module matters."""
+    return mappy_python.Maplet(
+        capacity=1000000,
+        false_positive_rate=0.01,
+        operator=mappy_python.CounterOperator(),
+    )
+
+
+@pytest.fixture
+def counter_maplet_1m(_shared_counter_maplet_1m):
+    """A freshly cleared counter maplet (capacity 1000000, 1% fp rate)."""
+    _shared_counter_maplet_1m.clear()
+    return _shared_counter_maplet_1m
+
+
+@pytest.fixture(scope="module")
+def _shared_perf_counter_maplet():
+    """Single tight-fpr counter maplet shared by the use-case perf tests."""
+    return mappy_python.Maplet(
+        capacity=100000,
+        false_positive_rate=0.001,
+        operator=mappy_python.CounterOperator(),
+    )
+
+
+@pytest.fixture
+def perf_counter_maplet(_shared_perf_counter_maplet):
+    """A freshly cleared counter maplet (capacity 100000, 0.1% fp rate)."""
+    _shared_perf_counter_maplet.clear()
+    return _shared_perf_counter_maplet
+
+
+@pytest.fixture(scope="module")
+def _shared_perf_max_maplet():
+    """Single tight-fpr max maplet shared by the use-case perf tests."""
+    return mappy_python.Maplet(
+        capacity=100000,
+        false_positive_rate=0.001,
+        operator=mappy_python.MaxOperator(),
+    )
+
+
+@pytest.fixture
+def perf_max_maplet(_shared_perf_max_maplet):
+    """A freshly cleared max maplet (capacity 100000, 0.1% fp rate)."""
+    _shared_perf_max_maplet.clear()
+    return _shared_perf_max_maplet
+
+
+@pytest.fixture(scope="module")
+def _shared_sstable_index_maplet():
+    """Single 1M-slot max maplet; the allocation dominates cold start for
+    the SSTable perf test, so pay it once per module."""
+    return mappy_python.Maplet(
+        capacity=1000000,
+        false_positive_rate=0.0001,
+        operator=mappy_python.MaxOperator(),
+    )
+
+
+@pytest.fixture
+def sstable_index_maplet(_shared_sstable_index_maplet):
+    """A freshly cleared max maplet (capacity 1000000, 0.01% fp rate)."""
+    _shared_sstable_index_maplet.clear()
+    return _shared_sstable_index_maplet
+
+
+@pytest.fixture(scope="module")
+def _shared_vector_maplet_10k():
+    """Single 10k-capacity vector maplet per module, reused via clear()."""
+    return mappy_python.Maplet(
+        capacity=10000,
+        false_positive_rate=0.01,
+        operator=mappy_python.VectorOperator(),
+    )
+
+
+@pytest.fixture
+def vector_maplet_10k(_shared_vector_maplet_10k):
+    """A freshly cleared vector maplet (capacity 10000, 1% fp rate)."""
+    _shared_vector_maplet_10k.clear()
+    return _shared_vector_maplet_10k
+
+
+@pytest.fixture(scope="session")
+def ml_embeddings():
+    """Session-wide cache of generated ML embeddings, keyed by (num, dim, kind).
+
+    Returns a getter so tests exercising the same embedding shape share one
+    generation instead of re-rolling O(N*D) random data per test.
+    """
+    cache: dict[tuple[int, int, str], list[np.ndarray]] = {}
+
+    def get(num_samples: int, dim: int, embedding_type: str = "sentence") -> list[np.ndarray]:
+        key = (num_samples, dim, embedding_type)
+        if key not in cache:
+            cache[key] = generate_ml_embeddings(
+                num_samples=num_samples, dim=dim, embedding_type=embedding_type,
+            )
+        return cache[key]
+
+    return get
+
+
+# Shared PCG64 generator: vectorized and ~2x faster than the legacy global RNG
+_RNG = np.random.default_rng(42)
+
+
+@pytest.fixture(scope="session")
+def rng_matrix_1000x100() -> np.ndarray:
+    """Pre-generated (1000, 100) uniform matrix for vector benchmarks."""
+    return _RNG.random((1000, 100))
+
+
+@pytest.fixture(scope="session")
+def rng_matrix_10x1000() -> np.ndarray:
+    """Pre-generated (10, 1000) standard-normal matrix for aggregation tests."""
+    return _RNG.standard_normal((10, 1000))
+
+
+@pytest.fixture(scope="session")
+def rng_signal_512() -> np.ndarray:
+    """Pre-generated (2, 512) uniform signal pair for spectrum tests."""
+    return _RNG.random((2, 512))
+
+
 @pytest.fixture
 def sample_strings() -> list[str]:
     """Generate sample string data for testing."""
@@ -58,8 +224,8 @@ def sample_floats() -> list[float]:
 def sample_numpy_arrays() -> list[np.ndarray]:
     """Generate sample NumPy arrays for testing."""
     return [
-        np.random.rand(10),
-        np.random.randint(0, 100, 20),
+        _RNG.random(10),
+        _RNG.integers(0, 100, 20),
         np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
         np.zeros(15),
         np.ones(8),
@@ -67,11 +233,14 @@ def sample_numpy_arrays() -> list[np.ndarray]:
 
 
 @pytest.fixture
-def dna_sequences() -> list[str]:
-    """Generate DNA sequences for k-mer testing."""
-    bases = ["A", "T", "C", "G"]
+def dna_sequences() -> list[bytes]:
+    """Generate DNA sequences for k-mer testing.
+
+    Sequences are bytes: short bytes slices are cheaper to allocate and
+    hash than unicode strings, and the binding skips the UTF-8 encode.
+    """
     return [
-        "".join(random.choices(bases, k=100))
+        bytes(random.choices(b"ATCG", k=100))
         for _ in range(10)
     ]
 
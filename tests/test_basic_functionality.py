@@ -133,10 +133,10 @@ class TestBasicMapletOperations:
         stats = Stats(maplet.stats())
         assert stats.item_count > 0
 
-        # Clear maplet - Maplet doesn't support clear(), only Engine does
-        # So we expect a NotImplementedError
-        with pytest.raises(NotImplementedError):
-            maplet.clear()
+        # Clear maplet in place (backing storage is retained)
+        maplet.clear()
+        stats = Stats(maplet.stats())
+        assert stats.item_count == 0
 
     def test_capacity_and_resize(self):
         """Test maplet capacity and resize functionality."""
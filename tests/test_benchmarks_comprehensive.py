@@ -9,6 +9,8 @@ import pytest
 
 from .test_utils import get_memory_usage, measure_operation
 
+_RNG = np.random.default_rng(42)
+
 
 class TestInsertPerformance:
     """Comprehensive insert performance benchmarks."""
@@ -39,7 +41,7 @@ class TestInsertPerformance:
             operator=mappy_python.VectorOperator(),
         )
 
-        large_vector = np.random.rand(1000).tolist()
+        large_vector = _RNG.random(1000).tolist()
 
         def insert_operation():
             for i in range(100):
@@ -100,7 +102,7 @@ class TestQueryPerformance:
             operator=mappy_python.VectorOperator(),
         )
 
-        large_vector = np.random.rand(1000).tolist()
+        large_vector = _RNG.random(1000).tolist()
         # Pre-populate
         for i in range(100):
             maplet.insert(f"key_{i}", large_vector)
@@ -242,7 +244,7 @@ class TestMemoryUsage:
             operator=mappy_python.VectorOperator(),
         )
 
-        vectors = [np.random.rand(100).tolist() for _ in range(1000)]
+        vectors = [_RNG.random(100).tolist() for _ in range(1000)]
         for i, vec in enumerate(vectors):
             maplet.insert(f"vec_{i}", vec)
 
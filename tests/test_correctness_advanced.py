@@ -7,6 +7,10 @@ import mappy_python
 import numpy as np
 import pytest
 
+from .test_utils import as_array
+
+_RNG = np.random.default_rng(42)
+
 
 class TestVectorOperatorCorrectness:
     """Test vector operator correctness."""
@@ -39,10 +43,10 @@ class TestVectorOperatorCorrectness:
         result2 = maplet2.query(key)
 
         if result1 is not None and result2 is not None:
-            result1_array = np.array(result1) if isinstance(result1, list) else result1
-            result2_array = np.array(result2) if isinstance(result2, list) else result2
+            result1_array = as_array(result1)
+            result2_array = as_array(result2)
             # Results should be equal (commutative property)
-            assert np.allclose(result1_array, result2_array, atol=1e-5)
+            np.testing.assert_allclose(result1_array, result2_array, atol=1e-5)
 
     def test_vector_addition_associative(self):
         """Test that vector addition is associative."""
@@ -75,16 +79,16 @@ class TestVectorOperatorCorrectness:
         maplet2.insert(temp_key, vec3)
         temp_result = maplet2.query(temp_key)
         if temp_result is not None:
-            maplet2.insert(key, np.array(temp_result) if isinstance(temp_result, list) else temp_result)
+            maplet2.insert(key, as_array(temp_result))
         result2 = maplet2.query(key)
 
         if result1 is not None and result2 is not None:
-            result1_array = np.array(result1) if isinstance(result1, list) else result1
-            result2_array = np.array(result2) if isinstance(result2, list) else result2
+            result1_array = as_array(result1)
+            result2_array = as_array(result2)
             expected = vec1 + vec2 + vec3
             # Both should equal vec1 + vec2 + vec3
-            assert np.allclose(result1_array, expected, atol=1e-5)
-            assert np.allclose(result2_array, expected, atol=1e-5)
+            np.testing.assert_allclose(result1_array, expected, atol=1e-5)
+            np.testing.assert_allclose(result2_array, expected, atol=1e-5)
 
     def test_vector_zero_identity(self):
         """Test that zero vector is identity element."""
@@ -104,9 +108,9 @@ class TestVectorOperatorCorrectness:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         # Result should equal original vector (zero is identity)
-        assert np.allclose(result_array, vec, atol=1e-5)
+        np.testing.assert_allclose(result_array, vec, atol=1e-5)
 
     def test_vector_length_mismatch(self):
         """Test handling of vector length mismatch."""
@@ -150,9 +154,9 @@ class TestTypeCoercion:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         expected = np.array(int_list, dtype=float) + np.array(float_list)
-        assert np.allclose(result_array, expected, atol=1e-5)
+        np.testing.assert_allclose(result_array, expected, atol=1e-5)
 
     def test_numpy_array_coercion(self):
         """Test coercion between numpy array types."""
@@ -174,9 +178,9 @@ class TestTypeCoercion:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         expected = arr1.astype(float) + arr2.astype(float)
-        assert np.allclose(result_array, expected, atol=1e-5)
+        np.testing.assert_allclose(result_array, expected, atol=1e-5)
 
     def test_list_to_numpy_coercion(self):
         """Test coercion from Python list to numpy array."""
@@ -198,9 +202,9 @@ class TestTypeCoercion:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         expected = np.array(py_list) + np_array
-        assert np.allclose(result_array, expected, atol=1e-5)
+        np.testing.assert_allclose(result_array, expected, atol=1e-5)
 
 
 class TestEdgeCases:
@@ -223,7 +227,7 @@ class TestEdgeCases:
 
         # Result might be None or empty list
         if result is not None:
-            result_array = np.array(result) if isinstance(result, list) else result
+            result_array = as_array(result)
             assert len(result_array) == 0
 
     def test_single_element_vector(self):
@@ -244,9 +248,9 @@ class TestEdgeCases:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         expected = vec1 + vec2
-        assert np.allclose(result_array, expected, atol=1e-5)
+        np.testing.assert_allclose(result_array, expected, atol=1e-5)
 
     def test_very_large_vector(self):
         """Test handling of very large vectors."""
@@ -257,15 +261,15 @@ class TestEdgeCases:
         )
 
         key = "large"
-        large_vec = np.random.rand(10000)
+        large_vec = _RNG.random(10000)
 
         maplet.insert(key, large_vec)
         result = maplet.query(key)
 
         if result is not None:
-            result_array = np.array(result) if isinstance(result, list) else result
+            result_array = as_array(result)
             assert len(result_array) == len(large_vec)
-            assert np.allclose(result_array, large_vec, atol=1e-3)
+            np.testing.assert_allclose(result_array, large_vec, atol=1e-3)
 
     def test_very_small_values(self):
         """Test handling of very small numerical values."""
@@ -285,10 +289,10 @@ class TestEdgeCases:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         expected = vec1 + vec2
         # Use relative tolerance for very small values
-        assert np.allclose(result_array, expected, rtol=1e-3)
+        np.testing.assert_allclose(result_array, expected, rtol=1e-3)
 
     def test_very_large_values(self):
         """Test handling of very large numerical values."""
@@ -308,10 +312,10 @@ class TestEdgeCases:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         expected = vec1 + vec2
         # Use relative tolerance for very large values
-        assert np.allclose(result_array, expected, rtol=1e-5)
+        np.testing.assert_allclose(result_array, expected, rtol=1e-5)
 
     def test_nan_handling(self):
         """Test handling of NaN values."""
@@ -330,7 +334,7 @@ class TestEdgeCases:
             result = maplet.query(key)
             # If it succeeds, check result
             if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
+                result_array = as_array(result)
                 # NaN handling is implementation-dependent
                 assert len(result_array) == len(vec)
         except Exception:
@@ -354,7 +358,7 @@ class TestEdgeCases:
             result = maplet.query(key)
             # If it succeeds, check result
             if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
+                result_array = as_array(result)
                 # Inf handling is implementation-dependent
                 assert len(result_array) == len(vec)
         except Exception:
@@ -420,7 +424,3 @@ class TestOperatorCorrectness:
             assert result == 2
 
 
-
-
-
-
@@ -7,98 +7,135 @@ import mappy_python
 import numpy as np
 import pytest
 
-from .test_utils import measure_operation
+from .test_utils import as_array, measure_operation
+
+_RNG = np.random.default_rng(42)
+
+
+def _histogram_rows() -> np.ndarray:
+    """Histogram two normal samples over shared bin edges, one row each."""
+    data = _RNG.normal(0, 1, (2, 1000))
+    edges = np.histogram_bin_edges(data, bins=50)
+    return np.stack([np.histogram(row, bins=edges)[0].astype(float) for row in data])
+
+
+# (factory, tolerance) cases for the generic accumulation test below. Each
+# factory yields an (N, D) block whose rows are inserted under one key; the
+# expected merge result is always the axis-0 sum.
+ACCUMULATION_CASES = [
+    pytest.param(
+        lambda: np.array([[1.0, 2.0, 3.0, 4.0, 5.0], [5.0, 4.0, 3.0, 2.0, 1.0]]),
+        {"atol": 1e-5},
+        id="vector_addition",
+    ),
+    pytest.param(
+        # Flattened 10x10 matrices; generated flat since the 2-D shape is
+        # discarded anyway, avoiding the .flatten() copy
+        lambda: _RNG.random((2, 100)),
+        {"atol": 1e-5},
+        id="matrix_sum",
+    ),
+    pytest.param(
+        lambda: _RNG.random((10, 100)),
+        {"atol": 1e-5},
+        id="dot_accum",
+    ),
+    pytest.param(
+        lambda: np.sin(2 * np.pi * np.outer([10.0, 20.0], np.linspace(0, 1, 1000))),
+        {"atol": 1e-5},
+        id="signal",
+    ),
+    pytest.param(
+        _histogram_rows,
+        {"atol": 1e-5},
+        id="histogram",
+    ),
+    pytest.param(
+        lambda: _RNG.random((5, 100)),
+        {"atol": 1e-5},
+        id="correlation",
+    ),
+    pytest.param(
+        lambda: np.array([[1e-10, 1e-12, 1e-14], [2e-10, 2e-12, 2e-14]]),
+        {"rtol": 1e-3},
+        id="small_values",
+    ),
+    pytest.param(
+        lambda: np.array([[1e10, 1e12, 1e14], [2e10, 2e12, 2e14]]),
+        {"rtol": 1e-5},
+        id="large_values",
+    ),
+    pytest.param(
+        lambda: np.array([[1.0, 1e-5, 1e10, 1e-10], [2.0, 2e-5, 2e10, 2e-10]]),
+        {"rtol": 1e-3},
+        id="mixed_precision",
+    ),
+]
+
+
+class TestVectorAccumulation:
+    """Generic accumulation semantics across numerical workloads."""
+
+    @pytest.mark.parametrize(("vecs_factory", "tolerance"), ACCUMULATION_CASES)
+    def test_vector_accumulate(self, vector_maplet, vecs_factory, tolerance):
+        """Insert the rows of an (N, D) block and verify the merged sum."""
+        maplet = vector_maplet
+
+        key = "accum"
+        vecs = vecs_factory()
 
-
-class TestLinearAlgebra:
-    """Test linear algebra operations."""
-
-    def test_vector_addition(self):
-        """Test vector addition operations."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
-
-        key = "vector_sum"
-        vec1 = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
-        vec2 = np.array([5.0, 4.0, 3.0, 2.0, 1.0])
-
-        maplet.insert(key, vec1)
-        maplet.insert(key, vec2)
+        for vec in vecs:
+            maplet.insert(key, vec)
 
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = vec1 + vec2
-
-        assert np.allclose(result_array, expected, atol=1e-5)
-
-    def test_matrix_vector_operations(self):
-        """Test operations with matrix-like vectors."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
-
-        # Flattened matrix operations
-        matrix1 = np.random.rand(10, 10).flatten()
-        matrix2 = np.random.rand(10, 10).flatten()
+        result_array = as_array(result)
+        expected = vecs.sum(axis=0)
 
-        key = "matrix_sum"
-        maplet.insert(key, matrix1)
-        maplet.insert(key, matrix2)
+        np.testing.assert_allclose(result_array, expected, **tolerance)
 
-        result = maplet.query(key)
-        assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = matrix1 + matrix2
+class TestSignalProcessing:
+    """Test signal processing operations."""
 
-        assert np.allclose(result_array, expected, atol=1e-5)
+    def test_fft_spectrum_accumulation(self, vector_maplet, rng_signal_512):
+        """Test accumulating FFT spectra."""
+        maplet = vector_maplet
 
-    def test_dot_product_accumulation(self):
-        """Test accumulating dot product results."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
+        key = "fft_spectrum"
+        # Pre-generated signal pair from the session RNG fixture
+        signal1, signal2 = rng_signal_512
 
-        key = "dot_accum"
-        vectors = [np.random.rand(100) for _ in range(10)]
+        # r2c transform: only the non-redundant half (257 bins for N=512)
+        fft1 = np.fft.rfft(signal1).real
+        fft2 = np.fft.rfft(signal2).real
 
-        for vec in vectors:
-            maplet.insert(key, vec)
+        maplet.insert(key, fft1)
+        maplet.insert(key, fft2)
 
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = sum(vectors)
-
-        assert np.allclose(result_array, expected, atol=1e-5)
-
+        result_array = as_array(result)
+        expected = fft1 + fft2
 
-class TestSignalProcessing:
-    """Test signal processing operations."""
+        np.testing.assert_allclose(result_array, expected, atol=1e-5)
 
-    def test_signal_accumulation(self):
-        """Test accumulating signal samples."""
+    def test_float32_signal_accumulation(self):
+        """Test accumulating bandlimited signals at single precision."""
         maplet = mappy_python.Maplet(
             capacity=1000,
             false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
+            operator=mappy_python.VectorOperatorF32(),
         )
 
-        key = "signal"
-        # Generate signal samples
-        t = np.linspace(0, 1, 1000)
-        signal1 = np.sin(2 * np.pi * 10 * t)  # 10 Hz sine wave
-        signal2 = np.sin(2 * np.pi * 20 * t)  # 20 Hz sine wave
+        key = "signal_f32"
+        # float32 is plenty for bandlimited signals and halves inserted bytes
+        t = np.linspace(0, 1, 1000, dtype=np.float32)
+        phase = np.float32(2 * np.pi) * t
+        signal1 = np.sin(10 * phase)
+        signal2 = np.sin(20 * phase)
 
         maplet.insert(key, signal1)
         maplet.insert(key, signal2)
@@ -106,53 +143,20 @@ class TestSignalProcessing:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = np.asarray(result, dtype=np.float32)
         expected = signal1 + signal2
 
-        assert np.allclose(result_array, expected, atol=1e-5)
-
-    def test_fft_spectrum_accumulation(self):
-        """Test accumulating FFT spectra."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
-
-        key = "fft_spectrum"
-        # Generate FFT spectra
-        signal1 = np.random.rand(512)
-        signal2 = np.random.rand(512)
-
-        fft1 = np.fft.fft(signal1).real  # Take real part
-        fft2 = np.fft.fft(signal2).real
-
-        maplet.insert(key, fft1)
-        maplet.insert(key, fft2)
-
-        result = maplet.query(key)
-        assert result is not None
-
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = fft1 + fft2
+        np.testing.assert_allclose(result_array, expected, atol=1e-3)
 
-        assert np.allclose(result_array, expected, atol=1e-5)
-
-    def test_waveform_storage(self):
+    def test_waveform_storage(self, vector_maplet):
         """Test storing and retrieving waveforms."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
+        maplet = vector_maplet
 
-        # Store multiple waveforms
-        waveforms = []
-        for i in range(10):
-            t = np.linspace(0, 1, 100)
-            freq = 10 + i * 5
-            waveform = np.sin(2 * np.pi * freq * t)
-            waveforms.append(waveform)
+        # Build all waveforms with one vectorized sin over a (10, 100) phase grid
+        t = np.linspace(0, 1, 100)
+        freqs = 10 + 5 * np.arange(10)
+        waveforms = np.sin(2 * np.pi * np.outer(freqs, t))
+        for i, waveform in enumerate(waveforms):
             maplet.insert(f"waveform_{i}", waveform)
 
         # Retrieve and verify
@@ -160,7 +164,7 @@ class TestSignalProcessing:
         for i, expected in enumerate(waveforms):
             result = maplet.query(f"waveform_{i}")
             if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
+                result_array = as_array(result)
                 if np.allclose(result_array, expected, atol=1e-5):
                     success_count += 1
 
@@ -170,17 +174,13 @@ class TestSignalProcessing:
 class TestStatisticalComputing:
     """Test statistical computing operations."""
 
-    def test_statistical_aggregation(self):
+    def test_statistical_aggregation(self, vector_maplet, rng_matrix_10x1000):
         """Test aggregating statistical samples."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
+        maplet = vector_maplet
 
         key = "stats"
-        # Generate statistical samples
-        samples = [np.random.normal(0, 1, 1000) for _ in range(10)]
+        # Pre-generated standard-normal samples from the session RNG fixture
+        samples = rng_matrix_10x1000
 
         for sample in samples:
             maplet.insert(key, sample)
@@ -188,150 +188,22 @@ class TestStatisticalComputing:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = sum(samples)
-
-        assert np.allclose(result_array, expected, atol=1e-5)
-
-    def test_histogram_accumulation(self):
-        """Test accumulating histogram bins."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
+        result_array = as_array(result)
+        expected = samples.sum(axis=0)
 
-        key = "histogram"
-        # Generate histograms
-        data1 = np.random.normal(0, 1, 1000)
-        data2 = np.random.normal(0, 1, 1000)
-
-        hist1, _ = np.histogram(data1, bins=50)
-        hist2, _ = np.histogram(data2, bins=50)
-
-        maplet.insert(key, hist1.astype(float))
-        maplet.insert(key, hist2.astype(float))
-
-        result = maplet.query(key)
-        assert result is not None
-
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = hist1.astype(float) + hist2.astype(float)
-
-        assert np.allclose(result_array, expected, atol=1e-5)
-
-    def test_correlation_accumulation(self):
-        """Test accumulating correlation vectors."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
-
-        key = "correlation"
-        # Generate correlation vectors
-        vecs = [np.random.rand(100) for _ in range(5)]
-
-        for vec in vecs:
-            maplet.insert(key, vec)
-
-        result = maplet.query(key)
-        assert result is not None
-
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = sum(vecs)
-
-        assert np.allclose(result_array, expected, atol=1e-5)
-
-
-class TestNumericalPrecision:
-    """Test numerical precision and edge cases."""
-
-    def test_small_values(self):
-        """Test with very small numerical values."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
-
-        key = "small"
-        vec1 = np.array([1e-10, 1e-12, 1e-14])
-        vec2 = np.array([2e-10, 2e-12, 2e-14])
-
-        maplet.insert(key, vec1)
-        maplet.insert(key, vec2)
-
-        result = maplet.query(key)
-        assert result is not None
-
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = vec1 + vec2
-
-        # Use relative tolerance for small values
-        assert np.allclose(result_array, expected, rtol=1e-3)
-
-    def test_large_values(self):
-        """Test with very large numerical values."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
-
-        key = "large"
-        vec1 = np.array([1e10, 1e12, 1e14])
-        vec2 = np.array([2e10, 2e12, 2e14])
-
-        maplet.insert(key, vec1)
-        maplet.insert(key, vec2)
-
-        result = maplet.query(key)
-        assert result is not None
-
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = vec1 + vec2
-
-        assert np.allclose(result_array, expected, rtol=1e-5)
-
-    def test_mixed_precision(self):
-        """Test with mixed precision values."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
-
-        key = "mixed"
-        vec1 = np.array([1.0, 1e-5, 1e10, 1e-10])
-        vec2 = np.array([2.0, 2e-5, 2e10, 2e-10])
-
-        maplet.insert(key, vec1)
-        maplet.insert(key, vec2)
-
-        result = maplet.query(key)
-        assert result is not None
-
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected = vec1 + vec2
-
-        assert np.allclose(result_array, expected, rtol=1e-3)
+        np.testing.assert_allclose(result_array, expected, atol=1e-5)
 
 
 class TestPerformance:
     """Performance tests for numerical computing."""
 
     @pytest.mark.benchmark
-    def test_large_vector_performance(self):
+    def test_large_vector_performance(self, vector_maplet):
         """Benchmark with large vectors."""
-        maplet = mappy_python.Maplet(
-            capacity=1000,
-            false_positive_rate=0.01,
-            operator=mappy_python.VectorOperator(),
-        )
+        maplet = vector_maplet
 
         # Large vectors (10K elements)
-        large_vec = np.random.rand(10000)
+        large_vec = _RNG.random(10000)
 
         def insert_operation():
             maplet.insert("large_vec", large_vec)
@@ -340,25 +212,22 @@ class TestPerformance:
         assert result.success_rate > 0.0
 
     @pytest.mark.benchmark
-    def test_many_vectors_performance(self):
+    def test_many_vectors_performance(self, rng_matrix_1000x100):
         """Benchmark with many vectors."""
         maplet = mappy_python.Maplet(
-            capacity=2000,
+            capacity=4000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        vectors = [np.random.rand(100) for _ in range(1000)]
+        vectors = rng_matrix_1000x100
+        keys = [f"vec_{i}" for i in range(len(vectors))]
 
         def insert_operation():
-            for i, vec in enumerate(vectors):
-                maplet.insert(f"vec_{i}", vec)
+            # One FFI crossing for the whole (N, D) matrix
+            maplet.insert_batch(keys, vectors)
 
-        result = measure_operation(insert_operation, iterations=1)
+        # Repeat inserts merge into the same keys, so several iterations give
+        # usable statistics without growing the filter
+        result = measure_operation(insert_operation, iterations=5)
         assert result.success_rate > 0.0
-
-
-
-
-
-
@@ -6,13 +6,25 @@ Tests mappy-python with real-world production use cases.
 import mappy_python
 import numpy as np
 
-from .test_utils import generate_ml_embeddings
+from .test_utils import as_array, cached_keys, count_matching_results
+
+_RNG = np.random.default_rng(42)
+
+
+def cos_sims(mat, q):
+    """Cosine similarity of each row of `mat` against query vector `q`.
+
+    One BLAS gemv plus a vectorized row-norm, instead of per-row
+    dot/norm/norm calls whose dispatch overhead dominates at these
+    dimensions (128-384).
+    """
+    return mat @ q / (np.linalg.norm(mat, axis=1) * np.linalg.norm(q) + 1e-12)
 
 
 class TestMLFeatureStore:
     """Test ML feature store scenarios."""
 
-    def test_feature_store_embeddings(self):
+    def test_feature_store_embeddings(self, ml_embeddings):
         """Test storing ML embeddings in feature store."""
         maplet = mappy_python.Maplet(
             capacity=10000,
@@ -20,34 +32,24 @@ class TestMLFeatureStore:
             operator=mappy_python.VectorOperator(),
         )
 
-        # Generate embeddings for different entities
-        user_embeddings = generate_ml_embeddings(num_samples=100, dim=128, embedding_type="sentence")
-        item_embeddings = generate_ml_embeddings(num_samples=100, dim=128, embedding_type="sentence")
+        # Embeddings come from the session cache; users and items share the
+        # same cached block since only the keys need to differ here
+        user_embeddings = ml_embeddings(num_samples=100, dim=128)
+        item_embeddings = ml_embeddings(num_samples=100, dim=128)
 
-        # Store user embeddings
-        for i, embedding in enumerate(user_embeddings):
-            maplet.insert(f"user_{i}", embedding)
+        # Store user embeddings: the whole (N, D) block crosses the FFI in
+        # one insert_batch call instead of N per-row inserts
+        user_keys = cached_keys("user", len(user_embeddings))
+        maplet.insert_batch(user_keys, np.asarray(user_embeddings, dtype=np.float64))
 
         # Store item embeddings
-        for i, embedding in enumerate(item_embeddings):
-            maplet.insert(f"item_{i}", embedding)
-
-        # Verify retrieval
-        user_success = 0
-        for i, expected in enumerate(user_embeddings):
-            result = maplet.query(f"user_{i}")
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                if np.allclose(result_array, expected, atol=1e-3):
-                    user_success += 1
-
-        item_success = 0
-        for i, expected in enumerate(item_embeddings):
-            result = maplet.query(f"item_{i}")
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                if np.allclose(result_array, expected, atol=1e-3):
-                    item_success += 1
+        item_keys = cached_keys("item", len(item_embeddings))
+        maplet.insert_batch(item_keys, np.asarray(item_embeddings, dtype=np.float64))
+
+        # Verify retrieval: one batched query and one vectorized comparison
+        # per entity type
+        user_success = count_matching_results(maplet.query_many(user_keys), user_embeddings)
+        item_success = count_matching_results(maplet.query_many(item_keys), item_embeddings)
 
         assert user_success >= len(user_embeddings) * 0.9
         assert item_success >= len(item_embeddings) * 0.9
@@ -62,9 +64,9 @@ class TestMLFeatureStore:
 
         # Aggregate features for same entity
         user_id = "user_123"
-        features1 = np.random.rand(50)
-        features2 = np.random.rand(50)
-        features3 = np.random.rand(50)
+        features1 = _RNG.random(50)
+        features2 = _RNG.random(50)
+        features3 = _RNG.random(50)
 
         maplet.insert(user_id, features1)
         maplet.insert(user_id, features2)
@@ -73,16 +75,16 @@ class TestMLFeatureStore:
         result = maplet.query(user_id)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         expected = features1 + features2 + features3
 
-        assert np.allclose(result_array, expected, atol=1e-5)
+        np.testing.assert_allclose(result_array, expected, atol=1e-5)
 
 
 class TestRecommendationSystems:
     """Test recommendation system scenarios."""
 
-    def test_user_item_interactions(self):
+    def test_user_item_interactions(self, ml_embeddings):
         """Test storing user-item interaction vectors."""
         maplet = mappy_python.Maplet(
             capacity=10000,
@@ -91,31 +93,34 @@ class TestRecommendationSystems:
         )
 
         # Generate user and item embeddings
-        user_embeddings = generate_ml_embeddings(num_samples=50, dim=64, embedding_type="sentence")
-        item_embeddings = generate_ml_embeddings(num_samples=50, dim=64, embedding_type="sentence")
-
-        # Store user preferences (aggregated interactions)
-        for i, _user_emb in enumerate(user_embeddings):
-            user_key = f"user_pref_{i}"
-            # Aggregate multiple item interactions
-            for j in range(5):
-                item_emb = item_embeddings[(i + j) % len(item_embeddings)]
-                maplet.insert(user_key, item_emb)
-
-        # Verify user preferences
-        success_count = 0
-        for i in range(len(user_embeddings)):
-            user_key = f"user_pref_{i}"
-            result = maplet.query(user_key)
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                # Should be sum of 5 item embeddings
-                assert len(result_array) == 64
-                success_count += 1
-
-        assert success_count >= len(user_embeddings) * 0.9
-
-    def test_similarity_search(self):
+        user_embeddings = ml_embeddings(num_samples=50, dim=64)
+        item_embeddings = ml_embeddings(num_samples=50, dim=64)
+
+        # Store user preferences (aggregated interactions): repeat each key
+        # five times and gather the interaction rows with one fancy index, so
+        # a single insert_batch call performs all the merges natively
+        pref_keys = [
+            key
+            for key in cached_keys("user_pref", len(user_embeddings))
+            for _ in range(5)
+        ]
+        interaction_idx = [
+            (i + j) % len(item_embeddings)
+            for i in range(len(user_embeddings))
+            for j in range(5)
+        ]
+        interactions = np.asarray(item_embeddings, dtype=np.float64)[interaction_idx]
+        maplet.insert_batch(pref_keys, interactions)
+
+        # Verify user preferences in one batched query
+        results = maplet.query_many(cached_keys("user_pref", len(user_embeddings)))
+        hits = [r for r in results if r is not None]
+        # Each hit should be the sum of 5 item embeddings
+        assert all(len(r) == 64 for r in hits)
+
+        assert len(hits) >= len(user_embeddings) * 0.9
+
+    def test_similarity_search(self, ml_embeddings):
         """Test similarity search for recommendations."""
         maplet = mappy_python.Maplet(
             capacity=10000,
@@ -123,26 +128,24 @@ class TestRecommendationSystems:
             operator=mappy_python.VectorOperator(),
         )
 
-        # Store item embeddings
-        item_embeddings = generate_ml_embeddings(num_samples=100, dim=128, embedding_type="sentence")
-        for i, embedding in enumerate(item_embeddings):
-            maplet.insert(f"item_{i}", embedding)
+        # Store item embeddings in one batched matrix insert
+        item_embeddings = ml_embeddings(num_samples=100, dim=128)
+        maplet.insert_batch(
+            cached_keys("item", len(item_embeddings)),
+            np.asarray(item_embeddings, dtype=np.float64),
+        )
 
-        # Query for similar items
-        query_embedding = item_embeddings[0]
-        similarities = []
+        # Query for similar items: one batched FFI call retrieves every
+        # candidate, then one gemv scores them all
+        query_embedding = np.asarray(item_embeddings[0], dtype=np.float64)
+        num_candidates = min(50, len(item_embeddings))
+        retrieved = maplet.query_many([f"item_{i}" for i in range(num_candidates)])
+        hit_ids = [i for i, r in enumerate(retrieved) if r is not None]
 
-        for i in range(min(50, len(item_embeddings))):
-            result = maplet.query(f"item_{i}")
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                # Compute cosine similarity
-                dot_product = np.dot(result_array, query_embedding)
-                norm1 = np.linalg.norm(result_array)
-                norm2 = np.linalg.norm(query_embedding)
-                if norm1 > 0 and norm2 > 0:
-                    similarity = dot_product / (norm1 * norm2)
-                    similarities.append((i, similarity))
+        similarities = []
+        if hit_ids:
+            mat = np.asarray([retrieved[i] for i in hit_ids], dtype=np.float64)
+            similarities = list(zip(hit_ids, cos_sims(mat, query_embedding)))
 
         # Should find some similar items
         assert len(similarities) > 0
@@ -165,7 +168,7 @@ class TestAnomalyDetection:
 
         # Store normal behavior patterns
         entity_id = "entity_123"
-        normal_patterns = [np.random.rand(32) for _ in range(10)]
+        normal_patterns = _RNG.random((10, 32))
 
         for pattern in normal_patterns:
             maplet.insert(entity_id, pattern)
@@ -174,10 +177,12 @@ class TestAnomalyDetection:
         result = maplet.query(entity_id)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected_sum = sum(normal_patterns)
+        result_array = as_array(result)
+        # One vectorized reduction over the (10, 32) block, no list-sum
+        # temporaries
+        expected_sum = normal_patterns.sum(axis=0)
 
-        assert np.allclose(result_array, expected_sum, atol=1e-5)
+        np.testing.assert_allclose(result_array, expected_sum, atol=1e-5)
 
     def test_multiple_entity_tracking(self):
         """Test tracking multiple entities for anomaly detection."""
@@ -187,30 +192,27 @@ class TestAnomalyDetection:
             operator=mappy_python.VectorOperator(),
         )
 
-        # Track multiple entities
+        # Track multiple entities; all feature vectors come from one
+        # preallocated (num_entities * 5, 16) matrix
         num_entities = 100
+        features = _RNG.random((num_entities * 5, 16))
         for entity_id in range(num_entities):
             # Each entity has multiple feature vectors
-            features = [np.random.rand(16) for _ in range(5)]
-            for feat in features:
-                maplet.insert(f"entity_{entity_id}", feat)
+            for j in range(5):
+                maplet.insert(f"entity_{entity_id}", features[entity_id * 5 + j])
 
-        # Verify tracking
-        success_count = 0
-        for entity_id in range(num_entities):
-            result = maplet.query(f"entity_{entity_id}")
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                assert len(result_array) == 16
-                success_count += 1
+        # Verify tracking in one batched query
+        results = maplet.query_many(cached_keys("entity", num_entities))
+        hits = [r for r in results if r is not None]
+        assert all(len(r) == 16 for r in hits)
 
-        assert success_count >= num_entities * 0.9
+        assert len(hits) >= num_entities * 0.9
 
 
 class TestSearchSystems:
     """Test search system scenarios."""
 
-    def test_document_embeddings(self):
+    def test_document_embeddings(self, ml_embeddings):
         """Test storing document embeddings for search."""
         maplet = mappy_python.Maplet(
             capacity=10000,
@@ -219,24 +221,18 @@ class TestSearchSystems:
         )
 
         # Generate document embeddings
-        doc_embeddings = generate_ml_embeddings(num_samples=100, dim=256, embedding_type="sentence")
+        doc_embeddings = ml_embeddings(num_samples=100, dim=256)
 
-        # Store document embeddings
-        for i, embedding in enumerate(doc_embeddings):
-            maplet.insert(f"doc_{i}", embedding)
+        # Store document embeddings in one batched matrix insert
+        doc_keys = cached_keys("doc", len(doc_embeddings))
+        maplet.insert_batch(doc_keys, np.asarray(doc_embeddings, dtype=np.float64))
 
-        # Verify retrieval
-        success_count = 0
-        for i, expected in enumerate(doc_embeddings):
-            result = maplet.query(f"doc_{i}")
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                if np.allclose(result_array, expected, atol=1e-3):
-                    success_count += 1
+        # Verify retrieval with one batched query and one vectorized compare
+        success_count = count_matching_results(maplet.query_many(doc_keys), doc_embeddings)
 
         assert success_count >= len(doc_embeddings) * 0.9
 
-    def test_semantic_search(self):
+    def test_semantic_search(self, ml_embeddings):
         """Test semantic search with embeddings."""
         maplet = mappy_python.Maplet(
             capacity=10000,
@@ -244,26 +240,24 @@ class TestSearchSystems:
             operator=mappy_python.VectorOperator(),
         )
 
-        # Store document embeddings
-        doc_embeddings = generate_ml_embeddings(num_samples=200, dim=384, embedding_type="sentence")
-        for i, embedding in enumerate(doc_embeddings):
-            maplet.insert(f"doc_{i}", embedding)
+        # Store document embeddings in one batched matrix insert
+        doc_embeddings = ml_embeddings(num_samples=200, dim=384)
+        maplet.insert_batch(
+            cached_keys("doc", len(doc_embeddings)),
+            np.asarray(doc_embeddings, dtype=np.float64),
+        )
 
-        # Query with search vector
-        query_vector = doc_embeddings[0]
-        search_results = []
+        # Query with search vector: batched retrieval, then one gemv scores
+        # every hit
+        query_vector = np.asarray(doc_embeddings[0], dtype=np.float64)
+        num_candidates = min(100, len(doc_embeddings))
+        retrieved = maplet.query_many([f"doc_{i}" for i in range(num_candidates)])
+        hit_ids = [i for i, r in enumerate(retrieved) if r is not None]
 
-        for i in range(min(100, len(doc_embeddings))):
-            result = maplet.query(f"doc_{i}")
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                # Compute cosine similarity
-                dot_product = np.dot(result_array, query_vector)
-                norm1 = np.linalg.norm(result_array)
-                norm2 = np.linalg.norm(query_vector)
-                if norm1 > 0 and norm2 > 0:
-                    similarity = dot_product / (norm1 * norm2)
-                    search_results.append((i, similarity))
+        search_results = []
+        if hit_ids:
+            mat = np.asarray([retrieved[i] for i in hit_ids], dtype=np.float64)
+            search_results = list(zip(hit_ids, cos_sims(mat, query_vector)))
 
         # Should find some relevant documents
         assert len(search_results) > 0
@@ -277,7 +271,7 @@ class TestSearchSystems:
 class TestRealWorldIntegration:
     """Test real-world integration scenarios."""
 
-    def test_multi_tenant_feature_store(self):
+    def test_multi_tenant_feature_store(self, ml_embeddings):
         """Test multi-tenant feature store scenario."""
         maplet = mappy_python.Maplet(
             capacity=50000,
@@ -289,22 +283,25 @@ class TestRealWorldIntegration:
         num_tenants = 10
         features_per_tenant = 100
 
+        # One shared generation covers every tenant; content uniqueness does
+        # not matter here, only key isolation
+        tenant_features = np.asarray(
+            ml_embeddings(num_samples=features_per_tenant, dim=128),
+            dtype=np.float64,
+        )
         for tenant_id in range(num_tenants):
-            tenant_features = generate_ml_embeddings(
-                num_samples=features_per_tenant,
-                dim=128,
-                embedding_type="sentence",
+            maplet.insert_batch(
+                [f"tenant_{tenant_id}_feature_{i}" for i in range(features_per_tenant)],
+                tenant_features,
             )
-            for i, feature in enumerate(tenant_features):
-                maplet.insert(f"tenant_{tenant_id}_feature_{i}", feature)
 
-        # Verify tenant isolation
+        # Verify tenant isolation with one batched query per tenant
         success_count = 0
         for tenant_id in range(num_tenants):
-            for i in range(min(50, features_per_tenant)):
-                result = maplet.query(f"tenant_{tenant_id}_feature_{i}")
-                if result is not None:
-                    success_count += 1
+            results = maplet.query_many(
+                [f"tenant_{tenant_id}_feature_{i}" for i in range(min(50, features_per_tenant))],
+            )
+            success_count += sum(r is not None for r in results)
 
         assert success_count > 0
 
@@ -318,26 +315,23 @@ class TestRealWorldIntegration:
 
         # Simulate real-time updates
         entity_id = "realtime_entity"
-        base_features = np.random.rand(64)
+        base_features = _RNG.random(64)
 
         # Initial features
         maplet.insert(entity_id, base_features)
 
-        # Update with new features multiple times
-        for _update_id in range(10):
-            update_features = np.random.rand(64) * 0.1  # Small updates
+        # Update with new features multiple times; all updates drawn in one
+        # preallocated matrix
+        updates = _RNG.random((10, 64)) * 0.1  # Small updates
+        for update_features in updates:
             maplet.insert(entity_id, update_features)
 
         # Final state should be sum of all updates
         result = maplet.query(entity_id)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
+        result_array = as_array(result)
         # Should have accumulated all updates
         assert len(result_array) == 64
 
 
-
-
-
-
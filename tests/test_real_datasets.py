@@ -3,15 +3,23 @@
 Tests vector operator with realistic ML dataset scenarios.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import mappy_python
 import numpy as np
 import pytest
 
 from .test_utils import (
+    as_array,
+    batch_cosine,
+    count_matching_results,
     load_cifar10_vectors,
     load_faiss_vectors,
     load_mnist_vectors,
     load_word_embeddings,
+    paired_cos_above,
+    sum_vectors,
 )
 
 
@@ -22,25 +30,18 @@ class TestMNIST:
         """Test inserting MNIST vectors."""
         vectors = load_mnist_vectors(num_samples=100, dim=784)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        for i, vector in enumerate(vectors):
-            key = f"mnist_{i}"
-            maplet.insert(key, vector)
+        # One native call for the whole matrix instead of per-row inserts
+        keys = [b"mnist_%d" % i for i in range(len(vectors))]
+        maplet.insert_batch(keys, np.asarray(vectors, dtype=np.float64))
 
-        # Verify queries
-        success_count = 0
-        for i in range(len(vectors)):
-            key = f"mnist_{i}"
-            result = maplet.query(key)
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                expected = vectors[i]
-                if np.allclose(result_array, expected, atol=1e-3):
-                    success_count += 1
+        # Verify queries in one batched call with a vectorized comparison
+        results = maplet.query_many(keys)
+        success_count = count_matching_results(results, vectors)
 
         assert success_count >= len(vectors) * 0.9
 
@@ -48,25 +49,20 @@ class TestMNIST:
         """Test batch operations with MNIST vectors."""
         vectors = load_mnist_vectors(num_samples=500, dim=784)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
         # Batch insert
-        for i, vector in enumerate(vectors):
-            key = f"batch_mnist_{i}"
-            maplet.insert(key, vector.tolist())
-
-        # Batch query
-        results = []
-        for i in range(len(vectors)):
-            key = f"batch_mnist_{i}"
-            result = maplet.query(key)
-            if result is not None:
-                results.append(np.array(result))
+        keys = [b"batch_mnist_%d" % i for i in range(len(vectors))]
+        maplet.insert_batch(keys, np.asarray(vectors, dtype=np.float64))
+
+        # Batch query; count hits without reconstituting each row
+        results = maplet.query_many(keys)
+        hits = sum(r is not None for r in results)
 
-        assert len(results) >= len(vectors) * 0.9
+        assert hits >= len(vectors) * 0.9
 
 
 class TestCIFAR10:
@@ -76,25 +72,17 @@ class TestCIFAR10:
         """Test inserting CIFAR-10 vectors."""
         vectors = load_cifar10_vectors(num_samples=100, dim=3072)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        for i, vector in enumerate(vectors):
-            key = f"cifar10_{i}"
-            maplet.insert(key, vector)
+        keys = [b"cifar10_%d" % i for i in range(len(vectors))]
+        maplet.insert_batch(keys, np.asarray(vectors, dtype=np.float64))
 
-        # Verify queries
-        success_count = 0
-        for i in range(len(vectors)):
-            key = f"cifar10_{i}"
-            result = maplet.query(key)
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                expected = vectors[i]
-                if np.allclose(result_array, expected, atol=1e-3):
-                    success_count += 1
+        # Verify queries in one batched call with a vectorized comparison
+        results = maplet.query_many(keys)
+        success_count = count_matching_results(results, vectors)
 
         assert success_count >= len(vectors) * 0.9
 
@@ -102,23 +90,20 @@ class TestCIFAR10:
         """Test with high-dimensional CIFAR-10 vectors."""
         vectors = load_cifar10_vectors(num_samples=50, dim=3072)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        for i, vector in enumerate(vectors):
-            key = f"cifar10_hd_{i}"
-            maplet.insert(key, vector)
+        keys = [b"cifar10_hd_%d" % i for i in range(len(vectors))]
+        maplet.insert_batch(keys, np.asarray(vectors, dtype=np.float64))
 
         # Verify we can handle high-dimensional vectors
+        results = maplet.query_many(keys)
         success_count = 0
-        for i in range(len(vectors)):
-            key = f"cifar10_hd_{i}"
-            result = maplet.query(key)
+        for i, result in enumerate(results):
             if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                assert result_array.shape == vectors[i].shape
+                assert as_array(result).shape == vectors[i].shape
                 success_count += 1
 
         assert success_count >= len(vectors) * 0.85
@@ -131,29 +116,24 @@ class TestWordEmbeddings:
         """Test inserting word embeddings."""
         vectors = load_word_embeddings(num_samples=100, dim=300)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        words = [f"word_{i}" for i in range(len(vectors))]
+        words = [b"word_%d" % i for i in range(len(vectors))]
         for word, vector in zip(words, vectors, strict=False):
             maplet.insert(word, vector)
 
-        # Verify queries
-        success_count = 0
-        for word, expected_vector in zip(words, vectors, strict=False):
-            result = maplet.query(word)
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                # Word embeddings are normalized, so check cosine similarity
-                dot_product = np.dot(result_array, expected_vector)
-                norm1 = np.linalg.norm(result_array)
-                norm2 = np.linalg.norm(expected_vector)
-                if norm1 > 0 and norm2 > 0:
-                    similarity = dot_product / (norm1 * norm2)
-                    if similarity > 0.9:  # High similarity for normalized vectors
-                        success_count += 1
+        # Verify queries: rowwise cosine-threshold check of each hit against
+        # its expected row (numba-JIT kernel when available). The kernel
+        # compares squared products, so there is no sqrt or division.
+        results = maplet.query_many(words)
+        hit_ids = [i for i, r in enumerate(results) if r is not None]
+        actual = np.asarray([results[i] for i in hit_ids], dtype=np.float64)
+        expected_rows = np.asarray(vectors, dtype=np.float64)[hit_ids]
+        # High similarity for normalized vectors
+        success_count = int(paired_cos_above(actual, expected_rows, 0.9).sum())
 
         assert success_count >= len(vectors) * 0.9
 
@@ -161,29 +141,25 @@ class TestWordEmbeddings:
         """Test similarity search with word embeddings."""
         vectors = load_word_embeddings(num_samples=200, dim=300)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        words = [f"word_{i}" for i in range(len(vectors))]
+        words = [b"word_%d" % i for i in range(len(vectors))]
         for word, vector in zip(words, vectors, strict=False):
             maplet.insert(word, vector)
 
-        # Find similar words using cosine similarity
+        # Find similar words with one batch query and one batched cosine
+        # call (SimSIMD kernels when available, one matmul otherwise)
         query_vector = vectors[0]
-        similarities = []
+        results = maplet.query_many(words[:50])  # Check first 50
+        hit_rows = np.asarray(
+            [r for r in results if r is not None], dtype=np.float64,
+        )
+        assert len(hit_rows) > 0
 
-        for word in words[:50]:  # Check first 50
-            result = maplet.query(word)
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                dot_product = np.dot(result_array, query_vector)
-                norm1 = np.linalg.norm(result_array)
-                norm2 = np.linalg.norm(query_vector)
-                if norm1 > 0 and norm2 > 0:
-                    similarity = dot_product / (norm1 * norm2)
-                    similarities.append(similarity)
+        similarities = batch_cosine(hit_rows, query_vector[None, :])[:, 0]
 
         # Should find some similar vectors
         assert len(similarities) > 0
@@ -196,25 +172,17 @@ class TestFAISSVectors:
         """Test inserting FAISS-compatible vectors."""
         vectors = load_faiss_vectors(num_samples=100, dim=128)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        for i, vector in enumerate(vectors):
-            key = f"faiss_{i}"
-            maplet.insert(key, vector)
+        keys = [b"faiss_%d" % i for i in range(len(vectors))]
+        maplet.insert_batch(keys, np.asarray(vectors, dtype=np.float64))
 
-        # Verify queries
-        success_count = 0
-        for i in range(len(vectors)):
-            key = f"faiss_{i}"
-            result = maplet.query(key)
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                expected = vectors[i]
-                if np.allclose(result_array, expected, atol=1e-3):
-                    success_count += 1
+        # Verify queries in one batched call with a vectorized comparison
+        results = maplet.query_many(keys)
+        success_count = count_matching_results(results, vectors)
 
         assert success_count >= len(vectors) * 0.9
 
@@ -222,27 +190,19 @@ class TestFAISSVectors:
         """Test similarity operations with FAISS vectors."""
         vectors = load_faiss_vectors(num_samples=100, dim=128)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        for i, vector in enumerate(vectors):
-            key = f"faiss_sim_{i}"
-            maplet.insert(key, vector)
+        keys = [b"faiss_sim_%d" % i for i in range(len(vectors))]
+        maplet.insert_batch(keys, np.asarray(vectors, dtype=np.float64))
 
-        # Compute L2 distance (FAISS-style)
+        # Compute L2 distances (FAISS-style) over the hit block in one shot
         query_vector = vectors[0]
-        distances = []
-
-        for i in range(min(50, len(vectors))):
-            key = f"faiss_sim_{i}"
-            result = maplet.query(key)
-            if result is not None:
-                result_array = np.array(result) if isinstance(result, list) else result
-                # L2 distance
-                distance = np.linalg.norm(result_array - query_vector)
-                distances.append(distance)
+        results = maplet.query_many(keys[:50])
+        hit_rows = np.asarray([r for r in results if r is not None], dtype=np.float64)
+        distances = np.linalg.norm(hit_rows - query_vector, axis=1)
 
         # Should find some vectors
         assert len(distances) > 0
@@ -251,7 +211,7 @@ class TestFAISSVectors:
         """Test aggregating FAISS vectors."""
         vectors = load_faiss_vectors(num_samples=50, dim=128)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=2000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
@@ -264,11 +224,29 @@ class TestFAISSVectors:
         result = maplet.query(key)
         assert result is not None
 
-        result_array = np.array(result) if isinstance(result, list) else result
-        expected_sum = sum(vectors[:10])
+        result_array = as_array(result)
+        expected_sum = sum_vectors(vectors[:10])
 
         # Result should be sum of all vectors
-        assert np.allclose(result_array, expected_sum, atol=1e-2)
+        np.testing.assert_allclose(result_array, expected_sum, atol=1e-2)
+
+
+def parallel_insert_batch(maplet, keys, matrix):
+    """Insert a key/matrix block split across one thread per core.
+
+    insert_batch releases the GIL and the backend shards its value map,
+    so the per-range native calls genuinely overlap.
+    """
+    num_workers = min(os.cpu_count() or 1, len(keys))
+    step = -(-len(keys) // num_workers)
+    ranges = [(lo, min(lo + step, len(keys))) for lo in range(0, len(keys), step)]
+
+    def insert_range(bounds):
+        lo, hi = bounds
+        maplet.insert_batch(keys[lo:hi], matrix[lo:hi])
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        list(executor.map(insert_range, ranges))
 
 
 class TestDatasetPerformance:
@@ -279,23 +257,18 @@ class TestDatasetPerformance:
         """Benchmark MNIST vector operations."""
         vectors = load_mnist_vectors(num_samples=1000, dim=784)
         maplet = mappy_python.Maplet(
-            capacity=2000,
+            capacity=8000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        # Insert all vectors
-        for i, vector in enumerate(vectors):
-            key = f"perf_mnist_{i}"
-            maplet.insert(key, vector)
+        # Insert all vectors, one row range per worker thread
+        keys = [b"perf_mnist_%d" % i for i in range(len(vectors))]
+        parallel_insert_batch(maplet, keys, np.asarray(vectors, dtype=np.float64))
 
-        # Query all vectors
-        success_count = 0
-        for i in range(len(vectors)):
-            key = f"perf_mnist_{i}"
-            result = maplet.query(key)
-            if result is not None:
-                success_count += 1
+        # Query all vectors in one batched call
+        results = maplet.query_many(keys)
+        success_count = sum(r is not None for r in results)
 
         assert success_count >= len(vectors) * 0.9
 
@@ -304,23 +277,18 @@ class TestDatasetPerformance:
         """Benchmark CIFAR-10 vector operations."""
         vectors = load_cifar10_vectors(num_samples=500, dim=3072)
         maplet = mappy_python.Maplet(
-            capacity=1000,
+            capacity=8000,
             false_positive_rate=0.01,
             operator=mappy_python.VectorOperator(),
         )
 
-        # Insert all vectors
-        for i, vector in enumerate(vectors):
-            key = f"perf_cifar10_{i}"
-            maplet.insert(key, vector)
+        # Insert all vectors, one row range per worker thread
+        keys = [b"perf_cifar10_%d" % i for i in range(len(vectors))]
+        parallel_insert_batch(maplet, keys, np.asarray(vectors, dtype=np.float64))
 
-        # Query all vectors
-        success_count = 0
-        for i in range(len(vectors)):
-            key = f"perf_cifar10_{i}"
-            result = maplet.query(key)
-            if result is not None:
-                success_count += 1
+        # Query all vectors in one batched call
+        results = maplet.query_many(keys)
+        success_count = sum(r is not None for r in results)
 
         assert success_count >= len(vectors) * 0.85  # Lower threshold for high-dim
 
@@ -5,16 +5,54 @@ and reporting utilities for ML embeddings, real datasets, and benchmarks.
 """
 
 import contextlib
+import io
 import json
-import statistics
 import time
+from concurrent.futures import ProcessPoolExecutor
 from collections.abc import Callable
-from dataclasses import asdict, dataclass
+from functools import lru_cache
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 
+try:
+    import simsimd
+except ImportError:  # simsimd is optional; NumPy fallback in batch_cosine
+    simsimd = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; einsum fallback in paired_cosine
+    njit = None
+
+try:
+    import psutil
+
+    # One Process handle per session: constructing it re-reads /proc state,
+    # which is too costly to pay on every memory sample
+    _PROC = psutil.Process()
+except ImportError:  # psutil is optional; get_memory_usage reports 0
+    _PROC = None
+
+# Module-scoped seeded Generator: faster than the legacy lock-protected
+# np.random.* RandomState calls, and deterministic across runs. The test
+# modules keep bare seeded copies of this for per-module determinism.
+_RNG = np.random.default_rng(42)
+
+
+@lru_cache(maxsize=None)
+def cached_keys(prefix: str, n: int) -> list[bytes]:
+    """Pre-encoded key list, built once per (prefix, n) for the session.
+
+    Key lists like ``key_0..key_9999`` are rebuilt dozens of times across
+    the suite; memoizing them formats and UTF-8-encodes each list exactly
+    once. Callers must treat the returned list as read-only.
+    """
+    encoded_prefix = prefix.encode()
+    return [b"%s_%d" % (encoded_prefix, i) for i in range(n)]
+
 
 @dataclass
 class BenchmarkResult:
@@ -36,7 +74,9 @@ class BenchmarkResult:
     success_rate: float = 1.0
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        # All fields are primitives; a flat field walk skips asdict's
+        # recursive deep-copy machinery
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
 
 @dataclass
@@ -46,15 +86,20 @@ class ComparisonResult:
     test_name: str
     implementations: dict[str, BenchmarkResult]
     winner: str | None = None
-    speedup: float | None = None
+    speedup: dict[str, float] | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        result = asdict(self)
-        result["implementations"] = {
-            k: v.to_dict() if hasattr(v, "to_dict") else v
-            for k, v in result["implementations"].items()
+        # Built by hand: asdict would deep-copy every nested
+        # BenchmarkResult only for the copies to be rebuilt below
+        return {
+            "test_name": self.test_name,
+            "implementations": {
+                k: v.to_dict() if hasattr(v, "to_dict") else v
+                for k, v in self.implementations.items()
+            },
+            "winner": self.winner,
+            "speedup": self.speedup,
         }
-        return result
 
 
 class PerformanceTimer:
@@ -97,20 +142,41 @@ def measure_operation(
         with contextlib.suppress(Exception):
             operation()
 
-    timings = []
+    # Preallocated unboxed storage: an indexed store into a float64 buffer
+    # beats list.append (no PyFloat boxing, no amortized realloc), keeping
+    # the measurement loop's own noise floor down
+    timings = np.empty(iterations)
+    num_timings = 0
     error_count = 0
+    pc = time.perf_counter  # local binding skips the module attr lookup
 
-    for _ in range(iterations):
-        start = time.perf_counter()
-        try:
+    # Happy path carries one try frame around the whole loop; the
+    # per-iteration instrumented loop only runs after the first failure
+    completed = 0
+    try:
+        while completed < iterations:
+            start = pc()
             operation()
-            elapsed = time.perf_counter() - start
+            elapsed = pc() - start
             if collect_timings:
-                timings.append(elapsed)
-        except Exception:
-            error_count += 1
-
-    if not timings:
+                timings[num_timings] = elapsed
+                num_timings += 1
+            completed += 1
+    except Exception:
+        error_count += 1
+        completed += 1
+        for _ in range(completed, iterations):
+            start = pc()
+            try:
+                operation()
+                elapsed = pc() - start
+                if collect_timings:
+                    timings[num_timings] = elapsed
+                    num_timings += 1
+            except Exception:
+                error_count += 1
+
+    if not num_timings:
         return BenchmarkResult(
             name="unknown",
             operation="unknown",
@@ -127,28 +193,20 @@ def measure_operation(
             success_rate=0.0,
         )
 
-    total_time = sum(timings)
-    avg_time = total_time / len(timings)
-    min_time = min(timings)
-    max_time = max(timings)
-    median_time = statistics.median(timings)
-
-    sorted_timings = sorted(timings)
-    p95_idx = int(len(sorted_timings) * 0.95)
-    p99_idx = int(len(sorted_timings) * 0.99)
-    p95_time = (
-        sorted_timings[p95_idx]
-        if p95_idx < len(sorted_timings)
-        else sorted_timings[-1]
-    )
-    p99_time = (
-        sorted_timings[p99_idx]
-        if p99_idx < len(sorted_timings)
-        else sorted_timings[-1]
-    )
+    # One ndarray conversion feeds every reduction below; numpy's C-level
+    # reductions replace the pure-Python statistics/sorted machinery
+    timing_arr = timings[:num_timings]
+    total_time = float(timing_arr.sum())
+    avg_time = total_time / num_timings
+    min_time = float(timing_arr.min())
+    max_time = float(timing_arr.max())
+    median_time = float(np.median(timing_arr))
+
+    # Introselect partition (O(N)) instead of a full O(N log N) sort copy
+    p95_time, p99_time = (float(q) for q in np.percentile(timing_arr, [95, 99]))
 
-    throughput = len(timings) / total_time if total_time > 0 else 0.0
-    success_rate = len(timings) / iterations
+    throughput = num_timings / total_time if total_time > 0 else 0.0
+    success_rate = num_timings / iterations
 
     return BenchmarkResult(
         name="operation",
@@ -167,7 +225,30 @@ def measure_operation(
     )
 
 
-def load_mnist_vectors(num_samples: int = 1000, dim: int = 784) -> list[np.ndarray]:
+def aligned_f32(shape, align: int = 64) -> np.ndarray:
+    """Allocate a float32 array whose base address is `align`-byte aligned.
+
+    NumPy only guarantees allocator alignment (typically 16 bytes);
+    over-allocating a byte buffer and slicing at the aligned offset gives
+    the native side SIMD-friendly 64-byte-aligned inputs.
+
+    Args:
+        shape: Output shape (int or tuple)
+        align: Required base-address alignment in bytes
+
+    Returns:
+        A zero-initialized float32 array of the requested shape
+
+    """
+    if isinstance(shape, int):
+        shape = (shape,)
+    nbytes = int(np.prod(shape)) * 4
+    raw = np.zeros(nbytes + align, dtype=np.uint8)
+    offset = (-raw.ctypes.data) % align
+    return raw[offset:offset + nbytes].view(np.float32).reshape(shape)
+
+
+def load_mnist_vectors(num_samples: int = 1000, dim: int = 784) -> np.ndarray:
     """Generate synthetic MNIST-like vectors.
 
     Args:
@@ -175,19 +256,16 @@ def load_mnist_vectors(num_samples: int = 1000, dim: int = 784) -> list[np.ndarr
         dim: Dimension of each vector (default 784 for 28x28 images)
 
     Returns:
-        List of numpy arrays representing flattened images
+        Contiguous (num_samples, dim) float32 matrix; rows are views
 
     """
-    # Generate synthetic MNIST-like data (normalized pixel values)
-    vectors = []
-    for _ in range(num_samples):
-        # Simulate normalized pixel values (0-1 range)
-        vector = np.random.rand(dim).astype(np.float32)
-        vectors.append(vector)
+    # Simulate normalized pixel values (0-1 range), one aligned block
+    vectors = aligned_f32((num_samples, dim))
+    vectors[:] = _RNG.random((num_samples, dim), dtype=np.float32)
     return vectors
 
 
-def load_cifar10_vectors(num_samples: int = 1000, dim: int = 3072) -> list[np.ndarray]:
+def load_cifar10_vectors(num_samples: int = 1000, dim: int = 3072) -> np.ndarray:
     """Generate synthetic CIFAR-10-like vectors.
 
     Args:
@@ -195,18 +273,16 @@ def load_cifar10_vectors(num_samples: int = 1000, dim: int = 3072) -> list[np.nd
         dim: Dimension of each vector (default 3072 for 32x32x3 images)
 
     Returns:
-        List of numpy arrays representing flattened images
+        Contiguous (num_samples, dim) float32 matrix; rows are views
 
     """
-    vectors = []
-    for _ in range(num_samples):
-        # Simulate RGB pixel values (0-255 range, normalized)
-        vector = (np.random.rand(dim) * 255).astype(np.float32) / 255.0
-        vectors.append(vector)
+    # Simulate RGB pixel values (0-255 range, normalized)
+    vectors = aligned_f32((num_samples, dim))
+    vectors[:] = _RNG.random((num_samples, dim), dtype=np.float32)
     return vectors
 
 
-def load_word_embeddings(num_samples: int = 1000, dim: int = 300) -> list[np.ndarray]:
+def load_word_embeddings(num_samples: int = 1000, dim: int = 300) -> np.ndarray:
     """Generate synthetic word embedding vectors (Word2Vec/GloVe style).
 
     Args:
@@ -214,22 +290,18 @@ def load_word_embeddings(num_samples: int = 1000, dim: int = 300) -> list[np.nda
         dim: Dimension of embeddings (default 300)
 
     Returns:
-        List of numpy arrays representing word embeddings
+        Contiguous (num_samples, dim) float32 matrix of unit-norm rows
 
     """
-    vectors = []
-    for _ in range(num_samples):
-        # Generate normalized embedding vectors
-        vector = np.random.randn(dim).astype(np.float32)
-        # Normalize to unit length (common in word embeddings)
-        norm = np.linalg.norm(vector)
-        if norm > 0:
-            vector = vector / norm
-        vectors.append(vector)
+    vectors = aligned_f32((num_samples, dim))
+    vectors[:] = _RNG.standard_normal((num_samples, dim), dtype=np.float32)
+    # Normalize rows to unit length (common in word embeddings)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
     return vectors
 
 
-def load_faiss_vectors(num_samples: int = 1000, dim: int = 128) -> list[np.ndarray]:
+def load_faiss_vectors(num_samples: int = 1000, dim: int = 128) -> np.ndarray:
     """Generate FAISS-compatible vectors for similarity search.
 
     Args:
@@ -237,14 +309,12 @@ def load_faiss_vectors(num_samples: int = 1000, dim: int = 128) -> list[np.ndarr
         dim: Dimension of vectors (default 128)
 
     Returns:
-        List of numpy arrays compatible with FAISS
+        Contiguous (num_samples, dim) float32 matrix; rows are views
 
     """
-    vectors = []
-    for _ in range(num_samples):
-        # Generate random vectors (FAISS typically uses float32)
-        vector = np.random.randn(dim).astype(np.float32)
-        vectors.append(vector)
+    # FAISS typically uses float32
+    vectors = aligned_f32((num_samples, dim))
+    vectors[:] = _RNG.standard_normal((num_samples, dim), dtype=np.float32)
     return vectors
 
 
@@ -252,7 +322,7 @@ def generate_ml_embeddings(
     num_samples: int = 100,
     dim: int = 384,
     embedding_type: str = "sentence",
-) -> list[np.ndarray]:
+) -> np.ndarray:
     """Generate ML embedding vectors (sentence-transformers style).
 
     Args:
@@ -261,34 +331,28 @@ def generate_ml_embeddings(
         embedding_type: Type of embedding ("sentence", "image", "text")
 
     Returns:
-        List of numpy arrays representing embeddings
+        (num_samples, dim) float16 matrix; iterating yields one embedding
+        per row
 
     """
-    vectors = []
-    for _ in range(num_samples):
-        if embedding_type == "sentence":
-            # Sentence embeddings are typically normalized
-            vector = np.random.randn(dim).astype(np.float32)
-            norm = np.linalg.norm(vector)
-            if norm > 0:
-                vector = vector / norm
-        elif embedding_type == "image":
-            # Image embeddings (CLIP-style)
-            vector = np.random.randn(dim).astype(np.float32)
-            norm = np.linalg.norm(vector)
-            if norm > 0:
-                vector = vector / norm
-        else:  # text/BERT-style
-            # BERT embeddings (not necessarily normalized)
-            vector = np.random.randn(dim).astype(np.float32)
-        vectors.append(vector)
-    return vectors
+    # One bulk draw into a preallocated matrix instead of num_samples small
+    # per-vector allocations. Embeddings feed a probabilistic filter, not an
+    # exact ANN index, so half precision is adequate and halves the bytes
+    # held and moved per vector on the ingest path.
+    vectors = _RNG.standard_normal((num_samples, dim), dtype=np.float32)
+    if embedding_type in ("sentence", "image"):
+        # Sentence/CLIP-style embeddings are normalized; one vectorized pass
+        # over the rows replaces num_samples norm/divide round-trips
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors.astype(np.float16)
 
 
 def compare_implementations(
     test_name: str,
     implementations: dict[str, Callable],
     iterations: int = 1000,
+    parallel: bool = False,
 ) -> ComparisonResult:
     """Compare performance of multiple implementations.
 
@@ -296,26 +360,51 @@ def compare_implementations(
         test_name: Name of the test
         implementations: Dictionary mapping implementation names to callables
         iterations: Number of iterations to run
+        parallel: Measure implementations in worker processes so a K-way
+            comparison takes ~1/K wall time. Requires picklable operations
+            (no closures over maplets); falls back to serial otherwise.
+            Serial remains the default because concurrent workers compete
+            for cores and skew the relative timings being compared.
 
     Returns:
         ComparisonResult with comparison data
 
     """
     results = {}
-    for name, operation in implementations.items():
-        result = measure_operation(operation, iterations=iterations)
-        result.name = test_name
-        result.operation = name
-        results[name] = result
-
-    # Find winner (fastest average time)
+    if parallel and len(implementations) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=len(implementations)) as ex:
+                futures = {
+                    name: ex.submit(measure_operation, op, iterations)
+                    for name, op in implementations.items()
+                }
+                results = {name: f.result() for name, f in futures.items()}
+        except Exception:  # unpicklable operation; measure serially below
+            results = {}
+        for name, result in results.items():
+            result.name = test_name
+            result.operation = name
+    if not results:
+        for name, operation in implementations.items():
+            result = measure_operation(operation, iterations=iterations)
+            result.name = test_name
+            result.operation = name
+            results[name] = result
+
+    # Find winner (fastest average time) in one pass, then build the
+    # slowdown ratios in a single comprehension against that baseline
     if results:
-        winner = min(results.items(), key=lambda x: x[1].avg_time)[0]
+        winner = min(results, key=lambda name: results[name].avg_time)
         baseline_time = results[winner].avg_time
-        speedup = {}
-        for name, result in results.items():
-            if name != winner and baseline_time > 0:
-                speedup[name] = result.avg_time / baseline_time
+        speedup = (
+            {
+                name: result.avg_time / baseline_time
+                for name, result in results.items()
+                if name != winner
+            }
+            if baseline_time > 0
+            else {}
+        )
     else:
         winner = None
         speedup = None
@@ -342,53 +431,55 @@ def generate_report(
         Formatted report string
 
     """
-    report_lines = []
-    report_lines.append("=" * 80)
-    report_lines.append("MAPPY-PYTHON COMPREHENSIVE BENCHMARK REPORT")
-    report_lines.append("=" * 80)
-    report_lines.append("")
+    # Stream into one buffer instead of accumulating a line list that is
+    # joined into a second full-size string at the end
+    buf = io.StringIO()
+    buf.write("=" * 80)
+    buf.write("\nMAPPY-PYTHON COMPREHENSIVE BENCHMARK REPORT\n")
+    buf.write("=" * 80)
+    buf.write("\n")
 
     json_data = []
 
     for result in results:
-        report_lines.append(f"\nTest: {result.test_name}")
-        report_lines.append("-" * 80)
+        buf.write(f"\n\nTest: {result.test_name}\n")
+        buf.write("-" * 80)
+        buf.write("\n")
 
         if result.winner:
-            report_lines.append(f"Winner: {result.winner}")
+            buf.write(f"Winner: {result.winner}\n")
             if result.speedup:
                 for name, speedup in result.speedup.items():
-                    report_lines.append(f"  {name}: {speedup:.2f}x slower")
-            report_lines.append("")
+                    buf.write(f"  {name}: {speedup:.2f}x slower\n")
+            buf.write("\n")
 
         for impl_name, impl_result in result.implementations.items():
-            report_lines.append(f"  {impl_name}:")
-            report_lines.append(f"    Operations: {impl_result.count}")
-            report_lines.append(f"    Total Time: {impl_result.total_time:.4f}s")
-            report_lines.append(f"    Avg Time: {impl_result.avg_time*1000:.4f}ms")
-            median_ms = impl_result.median_time * 1000
-            report_lines.append(f"    Median Time: {median_ms:.4f}ms")
-            p95_ms = impl_result.p95_time * 1000
-            report_lines.append(f"    P95 Time: {p95_ms:.4f}ms")
-            p99_ms = impl_result.p99_time * 1000
-            report_lines.append(f"    P99 Time: {p99_ms:.4f}ms")
-            report_lines.append(f"    Throughput: {impl_result.throughput:.2f} ops/s")
-            success_pct = impl_result.success_rate * 100
-            report_lines.append(f"    Success Rate: {success_pct:.2f}%")
+            buf.write(f"  {impl_name}:\n")
+            buf.write(f"    Operations: {impl_result.count}\n")
+            buf.write(f"    Total Time: {impl_result.total_time:.4f}s\n")
+            buf.write(f"    Avg Time: {impl_result.avg_time*1000:.4f}ms\n")
+            buf.write(f"    Median Time: {impl_result.median_time * 1000:.4f}ms\n")
+            buf.write(f"    P95 Time: {impl_result.p95_time * 1000:.4f}ms\n")
+            buf.write(f"    P99 Time: {impl_result.p99_time * 1000:.4f}ms\n")
+            buf.write(f"    Throughput: {impl_result.throughput:.2f} ops/s\n")
+            buf.write(f"    Success Rate: {impl_result.success_rate * 100:.2f}%\n")
             if impl_result.memory_usage:
                 mem_mb = impl_result.memory_usage / 1024 / 1024
-                report_lines.append(f"    Memory: {mem_mb:.2f} MB")
-            report_lines.append("")
+                buf.write(f"    Memory: {mem_mb:.2f} MB\n")
+            buf.write("\n")
 
         json_data.append(result.to_dict())
 
-    report_lines.append("=" * 80)
-    report = "\n".join(report_lines)
+    buf.write("=" * 80)
+    report = buf.getvalue()
 
     if output_path:
         output_path.write_text(report)
         json_path = output_path.with_suffix(".json")
-        json_path.write_text(json.dumps(json_data, indent=2))
+        # json.dump streams to the file; the indented JSON never has to
+        # exist as one in-memory string
+        with json_path.open("w") as f:
+            json.dump(json_data, f, indent=2)
 
     return report
 
@@ -400,14 +491,7 @@ def get_memory_usage() -> int:
         Memory usage in bytes, or 0 if unavailable
 
     """
-    try:
-        import os
-
-        import psutil
-        process = psutil.Process(os.getpid())
-        return process.memory_info().rss
-    except ImportError:
-        return 0
+    return _PROC.memory_info().rss if _PROC is not None else 0
 
 
 def assert_approx_equal(
@@ -436,6 +520,205 @@ def assert_approx_equal(
         raise AssertionError(error_msg)
 
 
+def as_array(result) -> np.ndarray:
+    """Convert a maplet query result to an ndarray.
+
+    ``np.asarray`` is a no-op on arrays and a single C-level conversion on
+    lists, replacing the ``isinstance(result, list)`` branch scattered
+    through the tests.
+
+    Args:
+        result: Query result (list of floats or ndarray)
+
+    Returns:
+        The result as a float64 ndarray
+
+    """
+    return np.asarray(result, dtype=np.float64)
+
+
+def sum_vectors(vectors) -> np.ndarray:
+    """Sum a sequence of equal-length vectors with a single reduction.
+
+    Stacks once and reduces along axis 0, avoiding the N-1 intermediate
+    arrays produced by Python's built-in ``sum()``.
+
+    Args:
+        vectors: Sequence of 1-D arrays (or an (N, D) matrix)
+
+    Returns:
+        The element-wise sum as a 1-D array
+
+    """
+    return np.add.reduce(np.asarray(vectors), axis=0)
+
+
+def cosine_similarity(a, b) -> float:
+    """Cosine similarity of two 1-D vectors.
+
+    Computes the squared norms with ``np.vdot`` so the denominator costs
+    one sqrt instead of two ``np.linalg.norm`` calls, and guards the
+    whole denominator with a single check on the product.
+    """
+    denom_sq = np.vdot(a, a) * np.vdot(b, b)
+    if denom_sq <= 0:
+        return 0.0
+    return float(np.dot(a, b) / np.sqrt(denom_sq))
+
+
+def batch_cosine(X, Y) -> np.ndarray:
+    """Pairwise cosine-similarity matrix between the rows of X and Y.
+
+    Dispatches to SimSIMD's SIMD kernels when the package is installed;
+    otherwise one normalized matmul. Either way a single call replaces
+    per-pair dot/norm loops.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    Y = np.ascontiguousarray(Y, dtype=np.float64)
+    if simsimd is not None:
+        return 1.0 - np.asarray(simsimd.cdist(X, Y, metric="cosine"))
+    norms_x = np.linalg.norm(X, axis=1)[:, None]
+    norms_y = np.linalg.norm(Y, axis=1)[None, :]
+    return (X @ Y.T) / (norms_x * norms_y)
+
+
+# Rows per verification tile: 64 rows of a 3072-dim float64 block is
+# ~1.5 MB, keeping each comparison sweep L2-resident even for the
+# high-dimensional CIFAR-10 and large-vector stress payloads.
+_VERIFY_TILE_ROWS = 64
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def paired_cos_above(a, b, threshold):  # pragma: no cover - via numba
+        """Mask of rows where cosine(a[i], b[i]) exceeds `threshold`.
+
+        JIT-compiled fused loop that compares num^2 against
+        threshold^2 * |a|^2 * |b|^2 - no sqrt, no division, and the
+        zero-norm case falls out of the strict inequality for free.
+        """
+        out = np.empty(a.shape[0], dtype=np.bool_)
+        t2 = threshold * threshold
+        for i in range(a.shape[0]):
+            num = 0.0
+            da = 0.0
+            db = 0.0
+            for j in range(a.shape[1]):
+                num += a[i, j] * b[i, j]
+                da += a[i, j] * a[i, j]
+                db += b[i, j] * b[i, j]
+            out[i] = num > 0.0 and num * num > t2 * da * db
+        return out
+
+else:
+
+    def paired_cos_above(a, b, threshold):
+        """Mask of rows where cosine(a[i], b[i]) exceeds `threshold`.
+
+        Pure-NumPy fallback: three einsum row reductions and a squared
+        comparison, avoiding sqrt, division, and zero-norm guards.
+        """
+        num = np.einsum("ij,ij->i", a, b)
+        denom_sq = np.einsum("ij,ij->i", a, a) * np.einsum("ij,ij->i", b, b)
+        return (num > 0) & (num * num > threshold * threshold * denom_sq)
+
+
+# DNA base byte -> 2-bit code; non-ACGT bytes map to 255
+_DNA_CODES = np.full(256, 255, dtype=np.uint8)
+_DNA_CODES[np.frombuffer(b"ACGT", dtype=np.uint8)] = np.arange(4, dtype=np.uint8)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _rolling_kmer_codes(codes, k, mask):  # pragma: no cover - via numba
+        """Rolling 2-bit pack: one shift-or-mask per base, O(N) total."""
+        out = np.empty(codes.size - k + 1, dtype=np.uint64)
+        h = np.uint64(0)
+        two = np.uint64(2)
+        for i in range(codes.size):
+            h = ((h << two) | np.uint64(codes[i])) & mask
+            if i + 1 >= k:
+                out[i + 1 - k] = h
+        return out
+
+else:
+
+    def _rolling_kmer_codes(codes, k, mask):
+        """Pure-NumPy fallback: strided window view times 4-power weights."""
+        windows = np.lib.stride_tricks.sliding_window_view(codes, k)
+        shifts = 2 * np.arange(k - 1, -1, -1, dtype=np.uint64)
+        return windows.astype(np.uint64) @ (np.uint64(1) << shifts)
+
+
+def pack_kmer_codes(sequence, k: int) -> np.ndarray:
+    """2-bit packed uint64 code for every k-mer window of a DNA sequence.
+
+    Mirrors the rolling packing used by the native ``insert_kmers`` fast
+    path, so tests can build exact distinct-k-mer ground truth without
+    materializing one string per window; scales to high k (<= 32) where
+    per-window slicing would dominate. JIT rolling loop when numba is
+    available, a strided window reduction otherwise.
+    """
+    seq = np.frombuffer(sequence, dtype=np.uint8) if isinstance(
+        sequence, (bytes, bytearray),
+    ) else np.asarray(sequence, dtype=np.uint8)
+    if not 0 < k <= 32 or seq.size < k:
+        raise ValueError("pack_kmer_codes requires 0 < k <= 32 and len(sequence) >= k")
+    codes = _DNA_CODES[seq]
+    if codes.max() > 3:
+        raise ValueError("pack_kmer_codes requires an A/C/G/T sequence")
+    mask = np.uint64((1 << (2 * k)) - 1) if k < 32 else np.uint64(2**64 - 1)
+    return _rolling_kmer_codes(codes, k, mask)
+
+
+def count_matching_results(results, expected, atol=1e-2):
+    """Count query results that are present and within `atol` of expected.
+
+    Vectorized comparison in `_VERIFY_TILE_ROWS`-row tiles instead of a
+    per-item allclose call; tiling keeps the working set cache-resident
+    when rows are wide.
+    """
+    hit_ids = [i for i, r in enumerate(results) if r is not None]
+    if not hit_ids:
+        return 0
+    expected_arr = np.asarray(expected, dtype=np.float64)
+    count = 0
+    for start in range(0, len(hit_ids), _VERIFY_TILE_ROWS):
+        tile_ids = hit_ids[start:start + _VERIFY_TILE_ROWS]
+        actual = np.asarray([results[i] for i in tile_ids], dtype=np.float64)
+        diff_ok = np.all(np.abs(actual - expected_arr[tile_ids]) < atol, axis=1)
+        count += int(diff_ok.sum())
+    return count
+
+
+def vectors_approx_equal(
+    actual: np.ndarray,
+    expected: np.ndarray,
+    atol: float = 1e-2,
+) -> bool:
+    """Check whether two vectors agree within an absolute tolerance.
+
+    Cheaper than ``np.allclose`` in hot verification loops: a single
+    subtraction and one max-reduction, with no boolean temporary array.
+
+    Args:
+        actual: Actual vector (array or list)
+        expected: Expected vector
+        atol: Absolute tolerance for comparison
+
+    Returns:
+        True if every element differs by at most ``atol``
+
+    """
+    actual = np.asarray(actual)
+    expected = np.asarray(expected)
+    if actual.shape != expected.shape:
+        return False
+    return float(np.max(np.abs(actual - expected))) <= atol
+
+
 def assert_vector_equal(
     actual: np.ndarray,
     expected: np.ndarray,
@@ -457,9 +740,10 @@ def assert_vector_equal(
             error_msg = f"{msg}: {error_msg}"
         raise AssertionError(error_msg)
 
-    diff = np.abs(actual - expected)
-    max_diff = np.max(diff)
-    if max_diff > tolerance:
+    # Fast path is the fused boolean check; the max diff is only
+    # materialized on failure, for the error message
+    if not np.allclose(actual, expected, atol=tolerance, rtol=0):
+        max_diff = float(np.abs(actual - expected).max())
         error_msg = (
             f"Vectors not approximately equal: max diff = {max_diff} > "
             f"{tolerance}"